@@ -14,6 +14,8 @@ class PathManager:
         self.assets_dir = os.path.join(self.base_dir, "assets")
         self.config_dir = os.path.join(self.base_dir, "config")
         self.output_base_dir = os.path.join(self.base_dir, "out")
+        # Per-user cache for derived files (e.g. rasterized SVGs)
+        self.cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "pyfamilytree")
         
         # Ensure base directories exist
         os.makedirs(self.assets_dir, exist_ok=True)
@@ -58,6 +60,11 @@ class PathManager:
         """Get the settings file path"""
         return os.path.join(self.config_dir, "settings.json")
     
+    def get_cache_dir(self) -> str:
+        """Get the cache directory, creating it on first use"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        return self.cache_dir
+    
     def get_xml_data_dir(self, excel_name: str, sheet_name: str) -> str:
         """Get XML data directory for a specific Excel file and sheet"""
         return os.path.join(self.assets_dir, excel_name, sheet_name)
@@ -0,0 +1,22 @@
+"""
+Shared access to the system web browser
+"""
+import webbrowser
+from typing import Optional
+
+# Controller for the default browser, looked up once per process
+_BROWSER: Optional[webbrowser.BaseBrowser] = None
+
+def get_browser() -> webbrowser.BaseBrowser:
+    """Return the default browser controller, discovering it on first use"""
+    global _BROWSER
+    if _BROWSER is None:
+        _BROWSER = webbrowser.get()
+    return _BROWSER
+
+def open_url(url: str) -> bool:
+    """Open url in the default browser, returning False if none is available"""
+    try:
+        return get_browser().open(url)
+    except webbrowser.Error:
+        return False
@@ -743,139 +743,3 @@ class AppController:
 
             if hasattr(e, '__traceback__'):
                 print(traceback.format_exc())
-
-class VisualizationDialog(ctk.CTkToplevel):
-    def __init__(self, parent):
-        super().__init__(parent)
-        self.title("Visualization Parameters")
-        self.geometry("400x400")  # Made taller for new option
-        
-        # Center the dialog
-        self.update_idletasks()
-        x = parent.winfo_x() + (parent.winfo_width() - self.winfo_width()) // 2
-        y = parent.winfo_y() + (parent.winfo_height() - self.winfo_height()) // 2
-        self.geometry(f"+{x}+{y}")
-        
-        # Generate All option
-        self.generate_all_var = ctk.BooleanVar(value=False)
-        self.generate_all = ctk.CTkCheckBox(
-            self,
-            text="Generate Complete Tree",
-            variable=self.generate_all_var,
-            command=self._toggle_inputs
-        )
-        self.generate_all.pack(padx=20, pady=(20, 10), fill="x")
-        
-        # Parameters frame
-        self.params_frame = ctk.CTkFrame(self)
-        self.params_frame.pack(padx=20, pady=10, fill="x")
-        
-        # Create widgets
-        self.start_person = ctk.CTkEntry(
-            self.params_frame,
-            placeholder_text="Starting person (optional)"
-        )
-        self.start_person.pack(padx=20, pady=10, fill="x")
-        
-        # Generations back with label
-        ctk.CTkLabel(
-            self.params_frame,
-            text="Generations Back (ancestors):"
-        ).pack(padx=20, pady=(10, 0), anchor="w")
-        
-        self.generations_back = ctk.CTkEntry(
-            self.params_frame,
-            placeholder_text="Number of generations back"
-        )
-        self.generations_back.pack(padx=20, pady=(0, 10), fill="x")
-        self.generations_back.insert(0, "0")
-        
-        # Generations forward with label
-        ctk.CTkLabel(
-            self.params_frame,
-            text="Generations Forward (descendants):"
-        ).pack(padx=20, pady=(10, 0), anchor="w")
-        
-        self.generations_forward = ctk.CTkEntry(
-            self.params_frame,
-            placeholder_text="Number of generations forward"
-        )
-        self.generations_forward.pack(padx=20, pady=(0, 10), fill="x")
-        self.generations_forward.insert(0, "0")
-        
-        # Style selection
-        self.style_var = ctk.StringVar(value="1")
-        self.style_frame = ctk.CTkFrame(self)
-        self.style_frame.pack(padx=20, pady=10, fill="x")
-        
-        ctk.CTkLabel(self.style_frame, text="Style:").pack(side="left", padx=5)
-        ctk.CTkRadioButton(
-            self.style_frame, text="Classic",
-            variable=self.style_var, value="1"
-        ).pack(side="left", padx=10)
-        ctk.CTkRadioButton(
-            self.style_frame, text="Embedded",
-            variable=self.style_var, value="2"
-        ).pack(side="left", padx=10)
-        
-        # Buttons
-        self.button_frame = ctk.CTkFrame(self)
-        self.button_frame.pack(padx=20, pady=20, fill="x")
-        
-        self.cancel_button = ctk.CTkButton(
-            self.button_frame, text="Cancel",
-            command=self.cancel
-        )
-        self.cancel_button.pack(side="left", padx=10, expand=True)
-        
-        self.ok_button = ctk.CTkButton(
-            self.button_frame, text="OK",
-            command=self.confirm
-        )
-        self.ok_button.pack(side="left", padx=10, expand=True)
-        
-        self.result = None
-        self.protocol("WM_DELETE_WINDOW", self.cancel)
-        self.grab_set()
-        self.wait_window()
-    
-    def _toggle_inputs(self):
-        """Enable/disable input fields based on Generate All checkbox"""
-        state = "disabled" if self.generate_all_var.get() else "normal"
-        self.start_person.configure(state=state)
-        self.generations_back.configure(state=state)
-        self.generations_forward.configure(state=state)
-    
-    def cancel(self):
-        """Cancel the dialog"""
-        self.result = None
-        self.destroy()
-    
-    def confirm(self):
-        """Confirm the dialog"""
-        try:
-            if self.generate_all_var.get():
-                self.result = {
-                    'generate_all': True,
-                    'style': self.style_var.get()
-                }
-            else:
-                self.result = {
-                    'generate_all': False,
-                    'start_person': self.start_person.get().strip(),
-                    'generations_back': int(self.generations_back.get() or 0),
-                    'generations_forward': int(self.generations_forward.get() or 0),
-                    'style': self.style_var.get()
-                }
-            self.destroy()
-        except ValueError:
-            # Show error if generations are not valid numbers
-            error_dialog = ctk.CTkInputDialog(
-                text="Please enter valid numbers for generations",
-                title="Error"
-            )
-            error_dialog.destroy()
-    
-    def get_parameters(self) -> Optional[Dict[str, Any]]:
-        """Get the dialog results"""
-        return self.result 
\ No newline at end of file
@@ -4,203 +4,154 @@ Dialog for configuring family tree visualization parameters.
 import customtkinter as ctk
 from typing import Optional, Dict, Any
 
+# Radio-button values, stored in IntVars rather than StringVars
+STYLE_CLASSIC = 1
+STYLE_MODERN = 2
+
 class VisualizationDialog(ctk.CTkToplevel):
     def __init__(self, parent):
         super().__init__(parent)
-        
-        # Configure window
-        self.title("Visualization Settings")
-        self.geometry("400x500")
-        self.resizable(False, False)
-        
-        # Initialize result
-        self.result: Optional[Dict[str, Any]] = None
-        
-        # Create main frame
-        self.main_frame = ctk.CTkFrame(self)
-        self.main_frame.pack(fill="both", expand=True, padx=20, pady=20)
-        
-        # Mode selection
-        self.mode_label = ctk.CTkLabel(
-            self.main_frame,
-            text="Visualization Mode",
-            font=ctk.CTkFont(size=14, weight="bold")
-        )
-        self.mode_label.pack(pady=(0, 10))
-        
-        self.mode_var = ctk.StringVar(value="specific")
-        
-        self.specific_radio = ctk.CTkRadioButton(
-            self.main_frame,
-            text="Specific View",
-            variable=self.mode_var,
-            value="specific",
+        self.title("Visualization Parameters")
+        self.geometry("400x400")  # Made taller for new option
+        
+        # Center the dialog
+        self.update_idletasks()
+        x = parent.winfo_x() + (parent.winfo_width() - self.winfo_width()) // 2
+        y = parent.winfo_y() + (parent.winfo_height() - self.winfo_height()) // 2
+        self.geometry(f"+{x}+{y}")
+        
+        # Generate All option
+        self.generate_all_var = ctk.BooleanVar(value=False)
+        self.generate_all = ctk.CTkCheckBox(
+            self,
+            text="Generate Complete Tree",
+            variable=self.generate_all_var,
             command=self._toggle_inputs
         )
-        self.specific_radio.pack(pady=5)
+        self.generate_all.pack(padx=20, pady=(20, 10), fill="x")
         
-        self.complete_radio = ctk.CTkRadioButton(
-            self.main_frame,
-            text="Complete Tree",
-            variable=self.mode_var,
-            value="complete",
-            command=self._toggle_inputs
-        )
-        self.complete_radio.pack(pady=5)
+        # Parameters frame
+        self.params_frame = ctk.CTkFrame(self)
+        self.params_frame.pack(padx=20, pady=10, fill="x")
         
-        # Specific view parameters
-        self.params_frame = ctk.CTkFrame(self.main_frame)
-        self.params_frame.pack(fill="x", pady=20)
-        
-        # Start person
-        self.start_label = ctk.CTkLabel(
+        # Create widgets
+        self.start_person = ctk.CTkEntry(
             self.params_frame,
-            text="Start Person (leave empty for root):"
+            placeholder_text="Starting person (optional)"
         )
-        self.start_label.pack(pady=(10, 5))
-        
-        self.start_entry = ctk.CTkEntry(self.params_frame)
-        self.start_entry.pack(fill="x", padx=20)
+        self.start_person.pack(padx=20, pady=10, fill="x")
         
-        # Generations back
-        self.back_label = ctk.CTkLabel(
+        # Generations back with label
+        ctk.CTkLabel(
             self.params_frame,
-            text="Generations Back:"
-        )
-        self.back_label.pack(pady=(10, 5))
+            text="Generations Back (ancestors):"
+        ).pack(padx=20, pady=(10, 0), anchor="w")
         
-        self.back_var = ctk.StringVar(value="2")
-        self.back_entry = ctk.CTkEntry(
+        self.generations_back = ctk.CTkEntry(
             self.params_frame,
-            textvariable=self.back_var
+            placeholder_text="Number of generations back"
         )
-        self.back_entry.pack(fill="x", padx=20)
+        self.generations_back.pack(padx=20, pady=(0, 10), fill="x")
+        self.generations_back.insert(0, "0")
         
-        # Generations forward
-        self.forward_label = ctk.CTkLabel(
+        # Generations forward with label
+        ctk.CTkLabel(
             self.params_frame,
-            text="Generations Forward:"
-        )
-        self.forward_label.pack(pady=(10, 5))
+            text="Generations Forward (descendants):"
+        ).pack(padx=20, pady=(10, 0), anchor="w")
         
-        self.forward_var = ctk.StringVar(value="2")
-        self.forward_entry = ctk.CTkEntry(
+        self.generations_forward = ctk.CTkEntry(
             self.params_frame,
-            textvariable=self.forward_var
+            placeholder_text="Number of generations forward"
         )
-        self.forward_entry.pack(fill="x", padx=20)
+        self.generations_forward.pack(padx=20, pady=(0, 10), fill="x")
+        self.generations_forward.insert(0, "0")
         
         # Style selection
-        self.style_label = ctk.CTkLabel(
-            self.main_frame,
-            text="Visual Style",
-            font=ctk.CTkFont(size=14, weight="bold")
+        self.style_var = ctk.IntVar(value=STYLE_CLASSIC)
+        self.style_frame = ctk.CTkFrame(self)
+        self.style_frame.pack(padx=20, pady=10, fill="x")
+        
+        ctk.CTkLabel(self.style_frame, text="Style:").pack(side="left", padx=5)
+        ctk.CTkRadioButton(
+            self.style_frame, text="Classic",
+            variable=self.style_var, value=STYLE_CLASSIC
+        ).pack(side="left", padx=10)
+        ctk.CTkRadioButton(
+            self.style_frame, text="Embedded",
+            variable=self.style_var, value=STYLE_MODERN
+        ).pack(side="left", padx=10)
+        
+        # Validation error message, packed only when there is an error
+        self.error_label = ctk.CTkLabel(
+            self,
+            text="",
+            text_color="red"
         )
-        self.style_label.pack(pady=(20, 10))
-        
-        self.style_var = ctk.StringVar(value="1")
-        
-        self.classic_radio = ctk.CTkRadioButton(
-            self.main_frame,
-            text="Classic",
-            variable=self.style_var,
-            value="1"
-        )
-        self.classic_radio.pack(pady=5)
-        
-        self.modern_radio = ctk.CTkRadioButton(
-            self.main_frame,
-            text="Modern",
-            variable=self.style_var,
-            value="2"
-        )
-        self.modern_radio.pack(pady=5)
         
         # Buttons
-        self.button_frame = ctk.CTkFrame(self.main_frame)
-        self.button_frame.pack(fill="x", pady=(20, 0))
+        self.button_frame = ctk.CTkFrame(self)
+        self.button_frame.pack(padx=20, pady=20, fill="x")
         
         self.cancel_button = ctk.CTkButton(
-            self.button_frame,
-            text="Cancel",
+            self.button_frame, text="Cancel",
             command=self.cancel
         )
         self.cancel_button.pack(side="left", padx=10, expand=True)
         
-        self.confirm_button = ctk.CTkButton(
-            self.button_frame,
-            text="Confirm",
+        self.ok_button = ctk.CTkButton(
+            self.button_frame, text="OK",
             command=self.confirm
         )
-        self.confirm_button.pack(side="right", padx=10, expand=True)
+        self.ok_button.pack(side="left", padx=10, expand=True)
         
-        # Make dialog modal
-        self.grab_set()
+        self.result = None
         self.protocol("WM_DELETE_WINDOW", self.cancel)
-        self.transient(parent)
-        
-        # Initial toggle
-        self._toggle_inputs()
+        self.grab_set()
+        self.wait_window()
     
     def _toggle_inputs(self):
-        """Toggle input fields based on mode"""
-        if self.mode_var.get() == "specific":
-            for widget in self.params_frame.winfo_children():
-                widget.configure(state="normal")
-        else:
-            for widget in self.params_frame.winfo_children():
-                widget.configure(state="disabled")
+        """Enable/disable input fields based on Generate All checkbox"""
+        state = "disabled" if self.generate_all_var.get() else "normal"
+        self.start_person.configure(state=state)
+        self.generations_back.configure(state=state)
+        self.generations_forward.configure(state=state)
     
     def cancel(self):
-        """Cancel dialog"""
+        """Cancel the dialog"""
         self.result = None
         self.destroy()
     
     def confirm(self):
-        """Confirm and save parameters"""
-        try:
-            # Get mode
-            is_complete = self.mode_var.get() == "complete"
-            
-            if is_complete:
-                # Complete tree mode
-                self.result = {
-                    'generate_all': True,
-                    'start_person': '',
-                    'generations_back': 0,
-                    'generations_forward': 0,
-                    'style': self.style_var.get()
-                }
-            else:
-                # Specific view mode
-                try:
-                    generations_back = int(self.back_var.get())
-                    generations_forward = int(self.forward_var.get())
-                except ValueError:
-                    raise ValueError("Generations must be valid numbers")
-                
-                if generations_back < 0 or generations_forward < 0:
-                    raise ValueError("Generations cannot be negative")
-                
-                self.result = {
-                    'generate_all': False,
-                    'start_person': self.start_entry.get().strip(),
-                    'generations_back': generations_back,
-                    'generations_forward': generations_forward,
-                    'style': self.style_var.get()
-                }
-            
-            self.destroy()
+        """Confirm the dialog"""
+        if self.generate_all_var.get():
+            self.result = {
+                'generate_all': True,
+                'style': str(self.style_var.get())
+            }
+        else:
+            # Empty fields count as zero generations
+            raw_back = self.generations_back.get().strip() or "0"
+            raw_forward = self.generations_forward.get().strip() or "0"
+            if not (raw_back.isdecimal() and raw_forward.isdecimal()):
+                self._show_inline_error("Please enter valid numbers for generations")
+                return
             
-        except Exception as e:
-            # Show error in a dialog
-            error_dialog = ctk.CTkInputDialog(
-                text=str(e),
-                title="Error"
-            )
-            error_dialog.destroy()  # Just show the message
+            self.result = {
+                'generate_all': False,
+                'start_person': self.start_person.get().strip(),
+                'generations_back': int(raw_back),
+                'generations_forward': int(raw_forward),
+                'style': str(self.style_var.get())
+            }
+        self.destroy()
+    
+    def _show_inline_error(self, message: str):
+        """Show a validation error above the dialog buttons"""
+        self.error_label.configure(text=message)
+        if not self.error_label.winfo_ismapped():
+            self.error_label.pack(before=self.button_frame, padx=20, pady=(10, 0))
     
     def get_parameters(self) -> Optional[Dict[str, Any]]:
-        """Get the dialog parameters"""
-        self.wait_window()
-        return self.result 
\ No newline at end of file
+        """Get the dialog results"""
+        return self.result
@@ -4,16 +4,91 @@ Handles large family trees with proper zoom, pan, and fit-to-window capabilities
 """
 import os
 import json
-import webbrowser
+import shutil
+import hashlib
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+from ..browser import open_url
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'templates')
+TEMPLATE_PATH = os.path.join(TEMPLATES_DIR, 'd3_tree_template_simple.html')
+SCRIPT_PATH = os.path.join(TEMPLATES_DIR, 'd3_tree_script.js')
+
+# First line of a generated HTML file; identifies the inputs it was built from
+HASH_MARKER = "<!--hash:{}-->\n"
+
+# Minimal page used when the template files are missing; formatted with character_json
+_FALLBACK_HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Interactive Family Tree - D3.js</title>
+    <script src="https://d3js.org/d3.v7.min.js"></script>
+    <style>
+        body {{ margin: 0; padding: 20px; font-family: Arial, sans-serif; }}
+        #tree-svg {{ width: 100%; height: 80vh; border: 1px solid #ccc; }}
+        .node {{ cursor: pointer; }}
+        .node:hover {{ stroke: #3498db; stroke-width: 3px; }}
+        .link {{ fill: none; stroke: #95a5a6; stroke-width: 2px; }}
+        .spouse-link {{ fill: none; stroke: #e74c3c; stroke-width: 2px; stroke-dasharray: 5,5; }}
+    </style>
+</head>
+<body>
+    <h1>Family Tree Visualization</h1>
+    <div id="tree-svg"></div>
+    
+    <script>
+        const characterData = {character_json};
+        
+        // Simple D3.js tree visualization
+        const svg = d3.select("#tree-svg").append("svg").attr("width", "100%").attr("height", "100%");
+        const g = svg.append("g");
+        
+        // Create a simple tree layout
+        const treeLayout = d3.tree().size([800, 600]);
+        
+        // Build tree data (simplified)
+        const root = d3.hierarchy({{ id: "root", name: "Family Tree", children: [] }});
+        
+        // Apply layout
+        treeLayout(root);
+        
+        // Draw links
+        g.selectAll(".link")
+            .data(root.links())
+            .enter().append("path")
+            .attr("class", "link")
+            .attr("d", d3.linkVertical().x(d => d.x).y(d => d.y));
+        
+        // Draw nodes
+        const nodes = g.selectAll(".node")
+            .data(root.descendants())
+            .enter().append("g")
+            .attr("class", "node")
+            .attr("transform", d => `translate(${{d.x}},${{d.y}})`);
+        
+        nodes.append("circle").attr("r", 10).attr("fill", "#3498db");
+        nodes.append("text").attr("dy", "0.35em").attr("y", 15).text(d => d.data.name);
+        
+        // Add zoom
+        const zoom = d3.zoom().on("zoom", (event) => g.attr("transform", event.transform));
+        svg.call(zoom);
+    </script>
+</body>
+</html>
+"""
+
 class D3FamilyTreeViewer:
     """
     Generates interactive D3.js-based family tree viewer
     Better handling of large trees with proper zoom and pan
     """
     
+    __slots__ = ('character_data', 'output_dir', 'html_path', 'script_path', '_last_hash')
+    
     def __init__(self, character_data: Dict[str, Dict[str, Any]], output_dir: str):
         """
         Initialize the D3.js viewer
@@ -25,6 +100,8 @@ class D3FamilyTreeViewer:
         self.character_data = character_data
         self.output_dir = Path(output_dir)
         self.html_path = self.output_dir / "d3_family_tree.html"
+        self.script_path = self.output_dir / "d3_tree_script.js"
+        self._last_hash: Optional[str] = None
         
     def generate_html(self) -> str:
         """
@@ -36,21 +113,57 @@ class D3FamilyTreeViewer:
         # Convert character data to JSON for JavaScript
         character_json = json.dumps(self.character_data, indent=2)
         
+        # Skip regeneration if the existing file was built from the same inputs
+        content_hash = self._content_hash(character_json)
+        if self._is_up_to_date(content_hash):
+            # The page still needs its script next to it; restore a deleted
+            # or stale copy (a cheap stat pair when it is current)
+            try:
+                self._copy_script(SCRIPT_PATH, str(self.script_path))
+            except FileNotFoundError:
+                pass  # Script source missing; nothing to restore
+            self._last_hash = content_hash
+            return str(self.html_path)
+        
         # Generate HTML template
         html_content = self._create_d3_template(character_json)
         
-        # Write HTML file
+        # Write HTML file, tagged with the content hash
         with open(self.html_path, 'w', encoding='utf-8') as f:
+            f.write(HASH_MARKER.format(content_hash))
             f.write(html_content)
         
+        self._last_hash = content_hash
         return str(self.html_path)
     
+    def _content_hash(self, character_json: str) -> str:
+        """Hash the character JSON together with the template and script mtimes"""
+        h = hashlib.blake2b(character_json.encode('utf-8'), digest_size=16)
+        for path in (TEMPLATE_PATH, SCRIPT_PATH):
+            try:
+                h.update(str(os.stat(path).st_mtime_ns).encode('ascii'))
+            except OSError:
+                h.update(b'missing')
+        return h.hexdigest()
+    
+    def _is_up_to_date(self, content_hash: str) -> bool:
+        """Check whether the HTML file on disk was generated from content_hash"""
+        if not self.html_path.exists():
+            return False
+        if self._last_hash == content_hash:
+            return True
+        try:
+            with open(self.html_path, 'r', encoding='utf-8') as f:
+                return f.readline() == HASH_MARKER.format(content_hash)
+        except OSError:
+            return False
+    
     def _create_d3_template(self, character_json: str) -> str:
         """Create the D3.js HTML template"""
         
         # Load simplified template from external file
-        template_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'templates', 'd3_tree_template_simple.html')
-        script_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'templates', 'd3_tree_script.js')
+        template_path = TEMPLATE_PATH
+        script_path = SCRIPT_PATH
         
         print(f"DEBUG: Looking for template at: {template_path}")
         print(f"DEBUG: Template exists: {os.path.exists(template_path)}")
@@ -66,85 +179,33 @@ class D3FamilyTreeViewer:
             html_content = template_content.replace('{CHARACTER_DATA}', character_json)
             
             # Copy the JavaScript file to the output directory
-            script_output_path = os.path.join(os.path.dirname(self.html_path), 'd3_tree_script.js')
-            
-            # Use a single context manager for both read and write operations
-            with open(script_path, 'r', encoding='utf-8') as src, \
-                 open(script_output_path, 'w', encoding='utf-8') as dst:
-                dst.write(src.read())
-            
-            print(f"DEBUG: JavaScript file copied to: {script_output_path}")
+            self._copy_script(script_path, str(self.script_path))
             
             return html_content
             
         except FileNotFoundError as e:
             print(f"DEBUG: Template file not found: {e}")
             # Fallback to a simple template if the file is not found
-            return f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Interactive Family Tree - D3.js</title>
-    <script src="https://d3js.org/d3.v7.min.js"></script>
-    <style>
-        body {{ margin: 0; padding: 20px; font-family: Arial, sans-serif; }}
-        #tree-svg {{ width: 100%; height: 80vh; border: 1px solid #ccc; }}
-        .node {{ cursor: pointer; }}
-        .node:hover {{ stroke: #3498db; stroke-width: 3px; }}
-        .link {{ fill: none; stroke: #95a5a6; stroke-width: 2px; }}
-        .spouse-link {{ fill: none; stroke: #e74c3c; stroke-width: 2px; stroke-dasharray: 5,5; }}
-    </style>
-</head>
-<body>
-    <h1>Family Tree Visualization</h1>
-    <div id="tree-svg"></div>
+            return _FALLBACK_HTML_TEMPLATE.format(character_json=character_json)
     
-    <script>
-        const characterData = {character_json};
-        
-        // Simple D3.js tree visualization
-        const svg = d3.select("#tree-svg").append("svg").attr("width", "100%").attr("height", "100%");
-        const g = svg.append("g");
-        
-        // Create a simple tree layout
-        const treeLayout = d3.tree().size([800, 600]);
-        
-        // Build tree data (simplified)
-        const root = d3.hierarchy({{ id: "root", name: "Family Tree", children: [] }});
-        
-        // Apply layout
-        treeLayout(root);
-        
-        // Draw links
-        g.selectAll(".link")
-            .data(root.links())
-            .enter().append("path")
-            .attr("class", "link")
-            .attr("d", d3.linkVertical().x(d => d.x).y(d => d.y));
-        
-        // Draw nodes
-        const nodes = g.selectAll(".node")
-            .data(root.descendants())
-            .enter().append("g")
-            .attr("class", "node")
-            .attr("transform", d => `translate(${{d.x}},${{d.y}})`);
-        
-        nodes.append("circle").attr("r", 10).attr("fill", "#3498db");
-        nodes.append("text").attr("dy", "0.35em").attr("y", 15).text(d => d.data.name);
-        
-        // Add zoom
-        const zoom = d3.zoom().on("zoom", (event) => g.attr("transform", event.transform));
-        svg.call(zoom);
-    </script>
-</body>
-</html>
-            """
+    def _copy_script(self, script_path: str, script_output_path: str) -> None:
+        """Copy the JavaScript file unless an up-to-date copy already exists"""
+        src_stat = os.stat(script_path)
+        try:
+            dst_stat = os.stat(script_output_path)
+            if (dst_stat.st_size == src_stat.st_size and
+                    dst_stat.st_mtime >= src_stat.st_mtime):
+                return
+        except FileNotFoundError:
+            pass
+        
+        # copyfile uses the platform's zero-copy primitives where available
+        shutil.copyfile(script_path, script_output_path)
+        print(f"DEBUG: JavaScript file copied to: {script_output_path}")
     
     def open_in_browser(self) -> None:
         """Open the generated HTML file in the default web browser"""
         if self.html_path.exists():
-            webbrowser.open(f"file://{self.html_path.absolute()}")
+            open_url(f"file://{self.html_path.absolute()}")
         else:
             raise FileNotFoundError(f"HTML file not found: {self.html_path}") 
\ No newline at end of file
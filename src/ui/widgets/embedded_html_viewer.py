@@ -5,35 +5,34 @@ import customtkinter as ctk
 import tkinter as tk
 from tkinter import ttk
 import os
-import webbrowser
 import tempfile
 import json
 from typing import Dict, Any, Optional
 import threading
 import time
 
-# Try different embedded browser solutions
-HAS_WEBVIEW = False
-HAS_CEFPYTHON = False
-HAS_TKHTML = False
-
-try:
-    import webview
-    HAS_WEBVIEW = True
-except ImportError:
-    pass
-
-try:
-    from cefpython3 import cef
-    HAS_CEFPYTHON = True
-except ImportError:
-    pass
-
-try:
-    import tkinter.html as tkhtml
-    HAS_TKHTML = True
-except ImportError:
-    pass
+from ..browser import open_url
+
+def _import_webview():
+    """Import pywebview on first use; returns None if it is not installed"""
+    try:
+        import webview
+    except ImportError:
+        return None
+    return webview
+
+# webview.start() runs the GUI loop until its last window closes, so a single
+# worker thread hosts it for every viewer and is restarted once it has ended
+_webview_thread: Optional[threading.Thread] = None
+_webview_lock = threading.Lock()
+
+def _start_webview(webview):
+    """Start the shared webview loop on its worker thread if not already running"""
+    global _webview_thread
+    with _webview_lock:
+        if _webview_thread is None or not _webview_thread.is_alive():
+            _webview_thread = threading.Thread(target=webview.start, daemon=True)
+            _webview_thread.start()
 
 class EmbeddedHTMLViewer(ctk.CTkFrame):
     """
@@ -87,7 +86,9 @@ class EmbeddedHTMLViewer(ctk.CTkFrame):
     
     def _determine_viewer_type(self):
         """Determine which type of viewer to use"""
-        if HAS_WEBVIEW:
+        # Optional backends are imported here rather than at module import time
+        self._webview = _import_webview()
+        if self._webview is not None:
             print("DEBUG: Using webview for embedded HTML")
             self._setup_webview()
         else:
@@ -123,49 +124,59 @@ class EmbeddedHTMLViewer(ctk.CTkFrame):
             self._show_error("HTML file not found")
             print("[DEBUG] HTML file not found:", file_path)
             return
-        if HAS_WEBVIEW:
+        if self._webview is not None:
             self._show_in_webview(file_path)
         else:
             self.open_in_browser()
 
     def _show_in_webview(self, file_path: str):
-        import threading
-        def run_webview():
-            import webview
+        url = f"file://{os.path.abspath(file_path)}"
+        window = self.webview_window
+        if window is not None:
+            # Reuse the existing window instead of creating a new one per load;
+            # load_url waits for the page to load, so keep it off the Tk thread
+            threading.Thread(target=window.load_url, args=(url,), daemon=True).start()
+        else:
             try:
                 parent_handle = self.webview_frame.winfo_id()
                 print(f"[DEBUG] Attempting to embed webview in frame with handle: {parent_handle}")
-                webview.create_window(
+                self.webview_window = self._webview.create_window(
                     "Family Tree Viewer",
-                    url=f"file://{os.path.abspath(file_path)}",
+                    url=url,
                     width=1200,
                     height=800,
                     resizable=True,
                     parent=parent_handle
                 )
-                webview.start()
+                window = self.webview_window
+                window.events.closed += lambda: self._forget_webview_window(window)
+                _start_webview(self._webview)
             except Exception as e:
                 print(f"[DEBUG] Embedding webview failed: {e}. (Fallbacks commented out for debugging)")
                 # try:
-                #     webview.create_window(
+                #     self.webview_window = self._webview.create_window(
                 #         "Family Tree Viewer",
-                #         url=f"file://{os.path.abspath(file_path)}",
+                #         url=url,
                 #         width=1200,
                 #         height=800,
                 #         resizable=True
                 #     )
-                #     webview.start()
+                #     _start_webview(self._webview)
                 # except Exception as e2:
                 #     print(f"[DEBUG] Separate webview window failed: {e2}. Falling back to browser.")
                 #     self.open_in_browser()
-        threading.Thread(target=run_webview, daemon=True).start()
         if hasattr(self, 'status_label'):
             self.status_label.configure(text="Embedded viewer loaded.")
 
+    def _forget_webview_window(self, window):
+        """Drop a window the user closed so the next load creates a new one"""
+        if self.webview_window is window:
+            self.webview_window = None
+
     def open_in_browser(self):
         """Open HTML file in external browser"""
         if self.html_file_path:
-            webbrowser.open(f"file://{os.path.abspath(self.html_file_path)}")
+            open_url(f"file://{os.path.abspath(self.html_file_path)}")
 
     def _show_error(self, message: str):
         self.details_text.delete("1.0", "end")
@@ -200,20 +211,3 @@ class EmbeddedHTMLViewer(ctk.CTkFrame):
             if not pdata.get('father_id') and not pdata.get('mother_id'):
                 roots.append(pid)
         return roots if roots else None
-
-    def _focus_on_nodes(self, node_ids):
-        """Auto-fit and center the canvas view to the bounding box of the given node_ids"""
-        # Find all polygons for these node_ids
-        focus_points = []
-        for item_id, info in self.svg_elements.items():
-            if info.get('type') == 'polygon' and info.get('person_id') in node_ids:
-                focus_points.extend(info['points'])
-        if not focus_points:
-            print(f"[DEBUG] _focus_on_nodes: No polygons found for node_ids {node_ids}")
-            return
-        min_x = min(focus_points[::2])
-        max_x = max(focus_points[::2])
-        min_y = min(focus_points[1::2])
-        max_y = max(focus_points[1::2])
-        print(f"[DEBUG] _focus_on_nodes: bbox x=({min_x},{max_x}), y=({min_y},{max_y}) for nodes {node_ids}")
-        self._auto_fit_canvas(min_x, max_x, min_y, max_y) 
\ No newline at end of file
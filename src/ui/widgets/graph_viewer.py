@@ -2,19 +2,88 @@
 Graph viewer widget for displaying family tree visualizations.
 """
 import customtkinter as ctk
+import PIL
 from PIL import Image, ImageTk
 import io
 import os
+import logging
+import math
+import hashlib
 import traceback
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import cairosvg
 import tkinter as tk
+import xml.etree.ElementTree as ET
+
+from ...core.path_manager import path_manager
+from .hit_testing import NodeBoxes, read_node_boxes
+
+logger = logging.getLogger("pyFamilyTree.graphviewer")
+logger.setLevel(logging.WARNING)
+
+# Canvas background; transparent image areas are flattened onto it at load
+CANVAS_BACKGROUND = "white"
+
+# Output size used when rasterizing SVGs for display
+SVG_RASTER_SIZE = (1920, 1080)
+
+# Stop halving pyramid levels once either side drops to this many pixels
+PYRAMID_MIN_SIZE = 512
+
+# Pillow-SIMD (released as "<version>.postN") vectorizes the BOX resize filter
+HAS_PILLOW_SIMD = '.post' in PIL.__version__
+
+# Cleared the first time Tk rejects a binary PPM upload (very old Tk builds)
+_ppm_upload_supported = True
+
+# Delay used to coalesce pan/zoom/resize redraws (~one frame at 60 Hz)
+REDRAW_DELAY_MS = 16
+
+# A button-1 press released within this many pixels of where it started is
+# a click (node selection); anything further is a pan
+CLICK_SLOP_PX = 3
+
+# Background workers for SVG rasterization and image decoding
+_RASTER_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="graph-raster")
+
+# How often the Tk thread checks whether background work has finished
+POLL_MS = 50
+
+# SVGs viewed above 1x are re-rasterized at power-of-two widths up to this cap
+SVG_MAX_BAND_WIDTH = 8192
+
+# Large rasterizations are rendered in horizontal strips of this height to
+# cap the renderer's peak memory
+STRIP_HEIGHT = 1024
+
+SVG_NS = "http://www.w3.org/2000/svg"
+ET.register_namespace('', SVG_NS)
+ET.register_namespace('xlink', "http://www.w3.org/1999/xlink")
+
+# Number of zoom-band rasterizations kept in memory
+BAND_CACHE_SIZE = 2
+
+# Number of rendered viewport PhotoImages kept for revisited zoom/pan states
+TILE_CACHE_SIZE = 8
+
+# Idle time after the last pan/wheel event before the settled LANCZOS frame
+SETTLE_DELAY_MS = 150
+
+# Spare PhotoImages (evicted from the tile cache) kept for reuse
+PHOTO_POOL_SIZE = 2
+
+# Most SVG rasterizations kept in the on-disk cache; the least recently
+# written go first, and each SVG path keeps only its latest version
+RASTER_CACHE_ENTRIES = 32
 
 class GraphViewer(ctk.CTkScrollableFrame):
     def __init__(self, master, image_path: str, **kwargs):
-        print("\nDEBUG: Starting GraphViewer initialization")
-        print(f"DEBUG: Master widget type: {type(master)}")
-        print(f"DEBUG: Original image path: {image_path}")
-        print(f"DEBUG: Additional kwargs: {kwargs}")
+        logger.debug("Starting GraphViewer initialization")
+        logger.debug("Master widget type: %s", type(master))
+        logger.debug("Original image path: %s", image_path)
+        logger.debug("Additional kwargs: %s", kwargs)
         
         # Initialize with default appearance
         super().__init__(
@@ -25,7 +94,7 @@ class GraphViewer(ctk.CTkScrollableFrame):
             border_width=0,
             **kwargs
         )
-        print("DEBUG: Base class initialized")
+        logger.debug("Base class initialized")
         
         # Configure grid weights for proper expansion
         self.grid_columnconfigure(0, weight=1)
@@ -36,7 +105,7 @@ class GraphViewer(ctk.CTkScrollableFrame):
         self.main_frame.grid(row=0, column=0, sticky="nsew", padx=0, pady=0)
         self.main_frame.grid_columnconfigure(0, weight=1)
         self.main_frame.grid_rowconfigure(0, weight=1)
-        print("DEBUG: Main frame created")
+        logger.debug("Main frame created")
         
         # Create canvas for the image
         self.canvas = ctk.CTkCanvas(
@@ -44,10 +113,13 @@ class GraphViewer(ctk.CTkScrollableFrame):
             highlightthickness=0,
             width=800,
             height=600,
-            bg="white"
+            bg=CANVAS_BACKGROUND
         )
         self.canvas.grid(row=0, column=0, sticky="nsew", padx=0, pady=0)
-        print("DEBUG: Canvas created and configured")
+        # Canvas size, kept current by <Configure> instead of querying Tk
+        self._canvas_w = 800
+        self._canvas_h = 600
+        logger.debug("Canvas created and configured")
         
         # Create toolbar frame
         self.toolbar = ctk.CTkFrame(self.main_frame, height=40)
@@ -93,15 +165,25 @@ class GraphViewer(ctk.CTkScrollableFrame):
         # Fix double extension if present
         if image_path.lower().endswith('.svg.svg'):
             image_path = image_path[:-4]  # Remove one .svg
-            print(f"DEBUG: Fixed double extension, new path: {image_path}")
+            logger.debug("Fixed double extension, new path: %s", image_path)
         
         # Store the path
         self.image_path = os.path.abspath(image_path)
-        print(f"DEBUG: Final image path set to: {self.image_path}")
+        logger.debug("Final image path set to: %s", self.image_path)
         
         # Store reference to PhotoImage to prevent garbage collection
         self.photo = None
         self.original_image = None
+        # Canvas item showing the image and the canvas rectangle it covers
+        self.image_id = None
+        self._item_visible = False
+        self._rendered_region = None
+        # Mipmap levels of original_image; level i is downscaled by 2**i
+        self.pyramid = []
+        # LRU of rendered PhotoImages keyed by (level, zoom, source box, size)
+        self._tile_cache = OrderedDict()
+        # Evicted Tk photos whose pixel storage is reused for the next frame
+        self._photo_pool = []
         
         # Initialize zoom and pan variables
         self.zoom_factor = 1.0
@@ -110,6 +192,42 @@ class GraphViewer(ctk.CTkScrollableFrame):
         self.pan_offset_x = 0
         self.pan_offset_y = 0
         self.is_panning = False
+        # Where button 1 went down, and whether it has since moved beyond
+        # CLICK_SLOP_PX
+        self._press_x = 0
+        self._press_y = 0
+        self._dragged = False
+        
+        # Pending coalesced redraw (after() job id)
+        self._redraw_job = None
+        # (width, height, pan x, pan y, canvas width, canvas height) of the
+        # last frame drawn; redraws producing the same frame are skipped
+        self._last_rendered = None
+        
+        # Wheel steps accumulated until the next frame, and the zoom anchor
+        self._wheel_steps = 0
+        self._wheel_anchor = (0, 0)
+        self._wheel_job = None
+        
+        # While panning/wheel-zooming frames use the cheaper BILINEAR filter;
+        # _draft_drawn marks that the settled frame must be re-rendered
+        self._interacting = False
+        self._draft_drawn = False
+        self._settle_job = None
+        
+        # Background work: the in-flight load, futures awaiting a Tk-thread
+        # callback, and the after() job polling them
+        self._load_future = None
+        self._pending = []
+        self._poll_job = None
+        
+        # Raw SVG source and its rasterizations per zoom band (width -> image)
+        self._svg_bytes = None
+        self._band_cache = OrderedDict()
+        self._band_futures = {}
+        
+        # Node bounding boxes in original_image pixels, for hit testing
+        self._node_boxes = NodeBoxes([], [])
         
         # Initialize node interaction callbacks
         self.node_click_callback = None
@@ -135,76 +253,362 @@ class GraphViewer(ctk.CTkScrollableFrame):
             self.canvas.focus_set()
             
         except Exception as e:
-            # print(f"DEBUG: Warning - could not bind mouse events: {e}")
-            pass
+            logger.debug("Could not bind mouse events: %s", e)
         
         # Schedule image load
         self.after(100, self.load_image)
-        # print("DEBUG: Image load scheduled")
         
         # Bind resize event
-        # print("DEBUG: Resize event bound")
         try:
             self.bind('<Configure>', self.on_resize)
+            self.canvas.bind('<Configure>', self._on_canvas_configure)
         except Exception as e:
-            # print(f"DEBUG: Warning - could not bind resize event: {e}")
-            pass
-        
-        # print("DEBUG: GraphViewer initialization complete")
+            logger.debug("Could not bind resize event: %s", e)
     
     def load_image(self):
-        """Load and display the image"""
-        # print("\nDEBUG: Starting image load")
+        """Start loading the image in the background and display it when ready"""
         try:
             if not self.image_path:
                 self.show_error("No image path provided")
                 return
             
-            # print(f"DEBUG: Loading image from: {self.image_path}")
-            # print(f"DEBUG: File size: {os.path.getsize(self.image_path)} bytes")
-            
             # Check if file exists
             if not os.path.exists(self.image_path):
                 self.show_error(f"Image file not found: {self.image_path}")
                 return
+            logger.debug("Loading image from: %s", self.image_path)
             
             # Set PIL image size limits to prevent decompression bomb warnings
-            from PIL import Image
             Image.MAX_IMAGE_PIXELS = 200000000  # 200 million pixels limit
             
-            # If it's an SVG, convert to PNG for better display
-            if self.image_path.lower().endswith('.svg'):
-                # print("DEBUG: Converting SVG to PNG")
-                try:
-                    import cairosvg
-                    import io
-                    
-                    # Convert SVG to PNG bytes with size limits
-                    png_bytes = cairosvg.svg2png(
-                        url=self.image_path,
-                        output_width=1920,  # Max width
-                        output_height=1080   # Max height
-                    )
-                    
-                    # Create PIL Image from PNG bytes
-                    self.original_image = Image.open(io.BytesIO(png_bytes))
-                    
-                except ImportError:
-                    # If cairosvg is not available, try to load as regular image
-                    self.original_image = Image.open(self.image_path)
-            else:
-                self.original_image = Image.open(self.image_path)
-            
-            # print(f"DEBUG: Original image loaded, size: {self.original_image.size}, mode: {self.original_image.mode}")
+            if hasattr(self, 'status_label') and self.status_label:
+                self.status_label.configure(text="Rendering...")
             
-            # Reset zoom and center the image
-            self.zoom_reset()
+            # Rasterize/decode on a worker so the window stays responsive
+            self._load_future = _RASTER_POOL.submit(self._read_image_levels, self.image_path)
+            self._watch(self._load_future, self._on_load_done)
             
         except Exception as e:
             error_msg = f"Error loading image: {str(e)}"
-            print(f"DEBUG ERROR: {error_msg}")
+            logger.error("%s", error_msg)
             self.show_error(error_msg)
     
+    def _watch(self, future, callback):
+        """Call callback(future) on the Tk thread once future completes"""
+        self._pending.append((future, callback))
+        if self._poll_job is None:
+            self._poll_job = self.after(POLL_MS, self._poll_pending)
+    
+    def _poll_pending(self):
+        """Dispatch completed background futures to their callbacks"""
+        self._poll_job = None
+        pending, self._pending = self._pending, []
+        for future, callback in pending:
+            if future.done():
+                callback(future)
+            else:
+                self._pending.append((future, callback))
+        if self._pending and self._poll_job is None:
+            self._poll_job = self.after(POLL_MS, self._poll_pending)
+    
+    def _on_load_done(self, future):
+        """Install the result of a background load"""
+        if future is not self._load_future:
+            # Superseded by a newer load
+            return
+        
+        self._load_future = None
+        try:
+            pyramid, svg_bytes, node_boxes = future.result()
+        except Exception as e:
+            error_msg = f"Error loading image: {str(e)}"
+            logger.error("%s", error_msg)
+            self.show_error(error_msg)
+            return
+        
+        self._svg_bytes = svg_bytes
+        self._node_boxes = node_boxes
+        self._band_cache.clear()
+        self._band_futures.clear()
+        self._finish_load(pyramid)
+    
+    def _finish_load(self, pyramid):
+        """Install a loaded image and its pyramid, then show it"""
+        self.original_image = pyramid[0]
+        self.pyramid = pyramid
+        self._tile_cache.clear()
+        self._last_rendered = None
+        
+        logger.debug("Original image loaded, size: %s, mode: %s",
+                     self.original_image.size, self.original_image.mode)
+        
+        # Reset zoom and center the image
+        self.zoom_reset()
+    
+    @staticmethod
+    def _read_image_levels(image_path: str):
+        """
+        Load an image (rasterizing SVGs) and build its pyramid.
+        
+        Runs on a worker thread, so it must not touch any Tk objects.
+        
+        Returns:
+            tuple: (pyramid levels, raw SVG bytes or None for raster images,
+                    node boxes in base-level pixels)
+        """
+        svg_bytes = None
+        
+        # If it's an SVG, convert to PNG for better display
+        if image_path.lower().endswith('.svg'):
+            with open(image_path, 'rb') as f:
+                svg_bytes = f.read()
+            
+            # Reuse a previous rasterization of this exact file if present
+            cache_path = GraphViewer._raster_cache_path(image_path)
+            if not os.path.exists(cache_path):
+                # Convert SVG to PNG with size limits, written atomically
+                tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                try:
+                    cairosvg.svg2png(
+                        url=image_path,
+                        write_to=tmp_path,
+                        output_width=SVG_RASTER_SIZE[0],  # Max width
+                        output_height=SVG_RASTER_SIZE[1]   # Max height
+                    )
+                    os.replace(tmp_path, cache_path)
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.unlink(tmp_path)
+                GraphViewer._prune_raster_cache(cache_path)
+            
+            # Decode now so the file handle is released
+            image = Image.open(cache_path)
+            image.load()
+        else:
+            image = Image.open(image_path)
+        
+        # Image.open is lazy; decode here rather than on the first Tk-thread resize
+        image.load()
+        
+        pyramid = GraphViewer._build_pyramid(GraphViewer._to_display_mode(image))
+        if svg_bytes is not None:
+            node_boxes = read_node_boxes(svg_bytes, pyramid[0].width, pyramid[0].height)
+        else:
+            node_boxes = NodeBoxes([], [])
+        return pyramid, svg_bytes, node_boxes
+    
+    @staticmethod
+    def _rasterize(svg_bytes: bytes, width: int, height: int):
+        """Rasterize SVG source at the given pixel size (worker thread)"""
+        image = None
+        if height > 2 * STRIP_HEIGHT:
+            image = GraphViewer._rasterize_strips(svg_bytes, width, height)
+        
+        if image is None:
+            png_bytes = cairosvg.svg2png(
+                bytestring=svg_bytes,
+                output_width=width,
+                output_height=height
+            )
+            image = Image.open(io.BytesIO(png_bytes))
+        return GraphViewer._to_display_mode(image)
+    
+    @staticmethod
+    def _to_display_mode(image):
+        """
+        Convert an image to RGB once, up front, so redraws never convert modes.
+        
+        Transparency is flattened onto the canvas background, which is what
+        the canvas would show through it anyway.
+        """
+        if "A" in image.getbands() or "transparency" in image.info:
+            rgba = image.convert("RGBA")
+            flat = Image.new("RGB", rgba.size, CANVAS_BACKGROUND)
+            flat.paste(rgba, mask=rgba.getchannel("A"))
+            return flat
+        if image.mode != "RGB":
+            return image.convert("RGB")
+        return image
+    
+    @staticmethod
+    def _rasterize_strips(svg_bytes: bytes, width: int, height: int, strip_height: int = STRIP_HEIGHT):
+        """
+        Rasterize SVG source strip by strip and paste the strips together.
+        
+        Each strip re-renders the document with a viewBox covering only its
+        rows, matching the uniform "meet" scaling of a single full render.
+        
+        Returns:
+            Image or None if the SVG has no usable viewBox
+        """
+        root = ET.fromstring(svg_bytes)
+        try:
+            vb_x, vb_y, vb_w, vb_h = (float(v) for v in root.get('viewBox', '').replace(',', ' ').split())
+        except ValueError:
+            return None
+        if vb_w <= 0 or vb_h <= 0:
+            return None
+        
+        scale = min(width / vb_w, height / vb_h)
+        offset_x = (width - vb_w * scale) / 2
+        offset_y = (height - vb_h * scale) / 2
+        
+        root.set('width', str(width))
+        root.set('preserveAspectRatio', 'none')
+        
+        composite = None
+        for y0 in range(0, height, strip_height):
+            rows = min(strip_height, height - y0)
+            root.set('height', str(rows))
+            root.set('viewBox', "{} {} {} {}".format(
+                vb_x - offset_x / scale,
+                vb_y + (y0 - offset_y) / scale,
+                width / scale,
+                rows / scale
+            ))
+            png_bytes = cairosvg.svg2png(bytestring=ET.tostring(root))
+            strip = Image.open(io.BytesIO(png_bytes))
+            if composite is None:
+                composite = Image.new(strip.mode, (width, height))
+            composite.paste(strip, (0, y0))
+            strip.close()
+        
+        return composite
+    
+    @staticmethod
+    def _raster_cache_path(image_path: str) -> str:
+        """
+        Path of the cached PNG for an SVG.
+        
+        The name is a hash of the path, then a hash of the mtime, size and
+        raster size, so older versions of the same SVG can be found and dropped.
+        """
+        stat = os.stat(image_path)
+        path_key = hashlib.blake2b(image_path.encode('utf-8'), digest_size=8).hexdigest()
+        version_key = hashlib.blake2b(
+            f"{stat.st_mtime_ns}|{stat.st_size}|"
+            f"{SVG_RASTER_SIZE[0]}x{SVG_RASTER_SIZE[1]}".encode('utf-8'),
+            digest_size=8
+        ).hexdigest()
+        return os.path.join(path_manager.get_cache_dir(), f"{path_key}-{version_key}.png")
+    
+    @staticmethod
+    def _prune_raster_cache(cache_path: str):
+        """Drop other versions of cache_path's SVG, then the oldest entries beyond RASTER_CACHE_ENTRIES"""
+        cache_dir, name = os.path.split(cache_path)
+        path_prefix = name.split('-', 1)[0] + '-'
+        entries = []
+        try:
+            with os.scandir(cache_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith('.png') or entry.name == name:
+                        continue
+                    if entry.name.startswith(path_prefix):
+                        # Stale rasterization of the same SVG
+                        os.unlink(entry.path)
+                    else:
+                        entries.append((entry.stat().st_mtime_ns, entry.path))
+            entries.sort()
+            # The entry just written counts towards the limit
+            for _, path in entries[:max(0, len(entries) + 1 - RASTER_CACHE_ENTRIES)]:
+                os.unlink(path)
+        except OSError as e:
+            # Another viewer may be pruning at the same time; try again next load
+            logger.debug("Could not prune raster cache: %s", e)
+    
+    @staticmethod
+    def _build_pyramid(image):
+        """Precompute half-size levels of an image for zoomed-out display"""
+        level = image
+        pyramid = [level]
+        while level.width > PYRAMID_MIN_SIZE and level.height > PYRAMID_MIN_SIZE:
+            if HAS_PILLOW_SIMD:
+                level = level.resize((level.width // 2, level.height // 2), Image.Resampling.BOX)
+            else:
+                level = level.reduce(2)
+            pyramid.append(level)
+        return pyramid
+    
+    def _source_for_size(self, new_width):
+        """
+        Choose the image to resample for a display width.
+        
+        Returns:
+            tuple: (source image, cache key for it, resample filter)
+        """
+        if self._svg_bytes is not None and new_width > self.original_image.width:
+            # Zoomed in past the base raster: let the vector renderer supply
+            # the pixels. Neighbouring zoom steps share a power-of-two band.
+            band = min(2 ** math.ceil(math.log2(new_width)), SVG_MAX_BAND_WIDTH)
+            if band > self.original_image.width:
+                image = self._band_cache.get(band)
+                if image is not None:
+                    self._band_cache.move_to_end(band)
+                    return image, ('band', band), self._quality_filter()
+                self._request_band(band)
+        
+        # Scale from the closest pyramid level; only full resolution needs LANCZOS
+        idx = self._pyramid_index()
+        resample = Image.Resampling.BILINEAR if idx > 0 else self._quality_filter()
+        return self.pyramid[idx], idx, resample
+    
+    def _quality_filter(self):
+        """LANCZOS for settled frames, BILINEAR while the user is interacting"""
+        if self._interacting:
+            self._draft_drawn = True
+            return Image.Resampling.BILINEAR
+        return Image.Resampling.LANCZOS
+    
+    def _mark_interacting(self):
+        """Enter interaction mode and (re)start the idle timer that leaves it"""
+        self._interacting = True
+        if self._settle_job is not None:
+            self.after_cancel(self._settle_job)
+        self._settle_job = self.after(SETTLE_DELAY_MS, self._settle)
+    
+    def _settle(self):
+        """Leave interaction mode and redraw any BILINEAR frame with LANCZOS"""
+        self._settle_job = None
+        self._interacting = False
+        if self._draft_drawn:
+            self._draft_drawn = False
+            self._last_rendered = None
+            self.display_image()
+    
+    def _request_band(self, band):
+        """Rasterize the SVG at a band width in the background"""
+        if band in self._band_futures:
+            return
+        # Keep the base raster's aspect (and letterboxing) so coordinates line up
+        height = max(1, round(band * self.original_image.height / self.original_image.width))
+        future = _RASTER_POOL.submit(self._rasterize, self._svg_bytes, band, height)
+        self._band_futures[band] = future
+        self._watch(future, lambda f, band=band: self._on_band_done(band, f))
+    
+    def _on_band_done(self, band, future):
+        """Store a finished band rasterization and redraw with it"""
+        if self._band_futures.get(band) is not future:
+            return
+        del self._band_futures[band]
+        try:
+            image = future.result()
+        except Exception as e:
+            logger.error("Error rasterizing SVG at width %s: %s", band, e)
+            return
+        self._band_cache[band] = image
+        if len(self._band_cache) > BAND_CACHE_SIZE:
+            self._band_cache.popitem(last=False)[1].close()
+        # Same geometry, sharper source: force the redraw
+        self._last_rendered = None
+        self._schedule_redraw()
+    
+    def _pyramid_index(self) -> int:
+        """Pick the smallest pyramid level that is still at least the display size"""
+        if self.zoom_factor >= 1.0 or len(self.pyramid) <= 1:
+            return 0
+        idx = int(math.floor(math.log2(1.0 / self.zoom_factor)))
+        return min(max(idx, 0), len(self.pyramid) - 1)
+    
     def calculate_fit_zoom(self):
         """Calculate zoom factor to fit image in window"""
         if not self.original_image:
@@ -215,17 +619,7 @@ class GraphViewer(ctk.CTkScrollableFrame):
             return
         
         # Get canvas dimensions
-        try:
-            canvas_width = self.canvas.winfo_width()
-            canvas_height = self.canvas.winfo_height()
-        except tk.TclError:
-            # Canvas might be destroyed
-            return
-        
-        # If canvas not properly sized yet, use default
-        if canvas_width <= 1 or canvas_height <= 1:
-            canvas_width = 800
-            canvas_height = 600
+        canvas_width, canvas_height = self._canvas_size()
         
         # Calculate zoom factors for width and height
         zoom_x = canvas_width / self.original_image.width
@@ -249,41 +643,78 @@ class GraphViewer(ctk.CTkScrollableFrame):
         
         try:
             # Calculate new dimensions
-            new_width = int(self.original_image.width * self.zoom_factor)
-            new_height = int(self.original_image.height * self.zoom_factor)
+            new_width = max(1, int(self.original_image.width * self.zoom_factor))
+            new_height = max(1, int(self.original_image.height * self.zoom_factor))
             
-            # print(f"DEBUG: Scaling image to: {new_width}x{new_height} (factor: {self.zoom_factor:.2f})")
+            canvas_width, canvas_height = self._canvas_size()
             
-            # Scale the image
-            scaled_image = self.original_image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-            # Convert to PhotoImage for tkinter
-            self.photo = ImageTk.PhotoImage(scaled_image)
-            
-            # Clear canvas and display image with pan offsets
-            self.canvas.delete("all")
+            # Nothing visible changed (e.g. zooming out at the 0.1 floor)
+            frame = (new_width, new_height, round(self.pan_offset_x), round(self.pan_offset_y),
+                     canvas_width, canvas_height)
+            if frame == self._last_rendered:
+                return
+            self._last_rendered = frame
             
             # Position image using pan offsets
             image_x = self.pan_offset_x
             image_y = self.pan_offset_y
             
-            self.canvas.create_image(image_x, image_y, anchor=tk.NW, image=self.photo)
+            self._rendered_region = None
             
-            # Update scroll region to include the entire image area
-            # This allows for scrolling when the image is larger than the canvas
-            try:
-                canvas_width = self.canvas.winfo_width()
-                canvas_height = self.canvas.winfo_height()
-            except tk.TclError:
-                # Canvas might be destroyed
-                return
+            # Only the part of the scaled image that overlaps the canvas is rendered
+            view_x1, view_y1, view_x2, view_y2 = self._visible_region(
+                new_width, new_height, canvas_width, canvas_height
+            )
             
-            scroll_x1 = min(0, image_x)
-            scroll_y1 = min(0, image_y)
-            scroll_x2 = max(canvas_width, image_x + new_width)
-            scroll_y2 = max(canvas_height, image_y + new_height)
+            if view_x2 > view_x1 and view_y2 > view_y1:
+                level, idx, resample = self._source_for_size(new_width)
+                
+                # Map the visible canvas rectangle back into level pixels
+                scale_x = level.width / new_width
+                scale_y = level.height / new_height
+                source_box = (
+                    max(0.0, (view_x1 - image_x) * scale_x),
+                    max(0.0, (view_y1 - image_y) * scale_y),
+                    min(level.width, (view_x2 - image_x) * scale_x),
+                    min(level.height, (view_y2 - image_y) * scale_y),
+                )
+                size = (view_x2 - view_x1, view_y2 - view_y1)
+                
+                key = (idx, round(self.zoom_factor, 3),
+                       tuple(round(v, 2) for v in source_box), size, resample)
+                previous = self.photo
+                self.photo = self._tile_cache.get(key)
+                if self.photo is not None:
+                    # Identical frame already uploaded: no resize, no new photo
+                    self._tile_cache.move_to_end(key)
+                else:
+                    scaled_image = self._resample(level, size, resample, source_box, scale_x)
+                    
+                    # Convert to PhotoImage for tkinter
+                    self.photo = self._make_photo(scaled_image)
+                    self._tile_cache[key] = self.photo
+                    if len(self._tile_cache) > TILE_CACHE_SIZE:
+                        self._recycle_photo(self._tile_cache.popitem(last=False)[1])
+                
+                # Reuse the one image item so other canvas items survive redraws
+                if self.image_id is None:
+                    self.image_id = self.canvas.create_image(
+                        view_x1, view_y1, anchor=tk.NW, image=self.photo
+                    )
+                elif self.photo is previous and self._item_visible:
+                    # The item already shows this photo; only its position can differ
+                    self.canvas.coords(self.image_id, view_x1, view_y1)
+                else:
+                    self.canvas.itemconfigure(self.image_id, image=self.photo, state="normal")
+                    self.canvas.coords(self.image_id, view_x1, view_y1)
+                self._item_visible = True
+                self._rendered_region = (view_x1, view_y1, view_x2, view_y2)
+            elif self.image_id is not None:
+                # Image panned entirely off the canvas
+                self.canvas.itemconfigure(self.image_id, state="hidden")
+                self._item_visible = False
             
-            self.canvas.configure(scrollregion=(scroll_x1, scroll_y1, scroll_x2, scroll_y2))
+            self._update_scrollregion(new_width, new_height, canvas_width, canvas_height)
             
             # Update status
             if hasattr(self, 'status_label') and self.status_label:
@@ -293,15 +724,135 @@ class GraphViewer(ctk.CTkScrollableFrame):
             
         except Exception as e:
             error_msg = f"Error displaying image: {str(e)}"
-            print(f"DEBUG ERROR: {error_msg}")
+            logger.error("%s", error_msg)
             self.show_error(error_msg)
     
+    @staticmethod
+    def _resample(level, size, resample, source_box, scale):
+        """
+        Scale source_box of level down/up to size.
+        
+        Near-integer downscales (e.g. past the last pyramid level) use the
+        integer box filter of Image.reduce plus a tiny corrective resize.
+        """
+        factor = round(scale)
+        if factor >= 2 and abs(scale - factor) < 0.05:
+            box = tuple(int(round(v)) for v in source_box)
+            if box[2] > box[0] and box[3] > box[1]:
+                reduced = level.reduce(factor, box=box)
+                if reduced.size != size:
+                    reduced = reduced.resize(size, Image.Resampling.BILINEAR)
+                return reduced
+        return level.resize(size, resample, box=source_box)
+    
+    def _make_photo(self, image):
+        """
+        Convert a PIL image to a Tk photo image.
+        
+        RGB images are handed to Tk as a binary PPM blob, skipping the extra
+        full-image copy ImageTk makes; other modes (e.g. RGBA, whose alpha PPM
+        cannot carry) go through ImageTk.
+        """
+        global _ppm_upload_supported
+        if _ppm_upload_supported and image.mode == "RGB":
+            header = f"P6\n{image.width} {image.height}\n255\n".encode('ascii')
+            data = header + image.tobytes()
+            try:
+                if self._photo_pool:
+                    # Overwrite a spare photo in place instead of allocating one
+                    photo = self._photo_pool.pop()
+                    photo.configure(data=data, format="PPM")
+                    return photo
+                return tk.PhotoImage(master=self.canvas, data=data, format="PPM")
+            except tk.TclError:
+                _ppm_upload_supported = False
+        return ImageTk.PhotoImage(image)
+    
+    def _recycle_photo(self, photo):
+        """Keep a photo dropped from the tile cache for reuse by _make_photo"""
+        if (photo is not self.photo and isinstance(photo, tk.PhotoImage)
+                and len(self._photo_pool) < PHOTO_POOL_SIZE):
+            self._photo_pool.append(photo)
+    
+    def _visible_region(self, new_width, new_height, canvas_width, canvas_height):
+        """Canvas rectangle (x1, y1, x2, y2) covered by the zoomed image"""
+        return (
+            max(0, int(self.pan_offset_x)),
+            max(0, int(self.pan_offset_y)),
+            min(canvas_width, int(math.ceil(self.pan_offset_x + new_width))),
+            min(canvas_height, int(math.ceil(self.pan_offset_y + new_height))),
+        )
+    
+    def _update_scrollregion(self, new_width, new_height, canvas_width, canvas_height):
+        """Update scroll region to include the entire image area"""
+        # This allows for scrolling when the image is larger than the canvas
+        scroll_x1 = min(0, self.pan_offset_x)
+        scroll_y1 = min(0, self.pan_offset_y)
+        scroll_x2 = max(canvas_width, self.pan_offset_x + new_width)
+        scroll_y2 = max(canvas_height, self.pan_offset_y + new_height)
+        
+        self.canvas.configure(scrollregion=(scroll_x1, scroll_y1, scroll_x2, scroll_y2))
+    
+    def _pan_rendered_image(self, dx, dy):
+        """
+        Translate the drawn image for a pure pan.
+        
+        Returns:
+            bool: True if the already-rendered pixels still cover everything
+            that should be visible, so no resample is needed
+        """
+        if self.image_id is None or self._rendered_region is None:
+            return False
+        
+        self.canvas.move(self.image_id, dx, dy)
+        x1, y1, x2, y2 = self._rendered_region
+        self._rendered_region = (x1 + dx, y1 + dy, x2 + dx, y2 + dy)
+        
+        new_width = max(1, int(self.original_image.width * self.zoom_factor))
+        new_height = max(1, int(self.original_image.height * self.zoom_factor))
+        canvas_width, canvas_height = self._canvas_size()
+        
+        self._update_scrollregion(new_width, new_height, canvas_width, canvas_height)
+        
+        view_x1, view_y1, view_x2, view_y2 = self._visible_region(
+            new_width, new_height, canvas_width, canvas_height
+        )
+        if view_x2 <= view_x1 or view_y2 <= view_y1:
+            return True
+        x1, y1, x2, y2 = self._rendered_region
+        return x1 <= view_x1 and y1 <= view_y1 and x2 >= view_x2 and y2 >= view_y2
+    
+    def _canvas_size(self):
+        """Current canvas size, or the 800x600 default before it is laid out"""
+        if self._canvas_w <= 1 or self._canvas_h <= 1:
+            return 800, 600
+        return self._canvas_w, self._canvas_h
+    
+    def _on_canvas_configure(self, event):
+        """Track the canvas size and redraw for the new viewport"""
+        if (event.width, event.height) != (self._canvas_w, self._canvas_h):
+            self._canvas_w = event.width
+            self._canvas_h = event.height
+            self._schedule_redraw()
+    
+    def _schedule_redraw(self):
+        """Coalesce redraw requests into a single display_image call per frame"""
+        if self._redraw_job is not None:
+            self.after_cancel(self._redraw_job)
+        self._redraw_job = self.after(REDRAW_DELAY_MS, self._do_redraw)
+    
+    def _do_redraw(self):
+        """Run the pending redraw"""
+        self._redraw_job = None
+        self.display_image()
+    
     def zoom_in(self, event=None):
         """Zoom in by 20% around the center of the current view"""
         try:
             # Get canvas center for zoom focus
-            canvas_center_x = self.canvas.winfo_width() / 2
-            canvas_center_y = self.canvas.winfo_height() / 2
+            canvas_width, canvas_height = self._canvas_size()
+            canvas_center_x = canvas_width / 2
+            canvas_center_y = canvas_height / 2
             
             # Calculate the point in the image that's currently at the center
             old_image_center_x = (canvas_center_x - self.pan_offset_x) / self.zoom_factor
@@ -317,17 +868,17 @@ class GraphViewer(ctk.CTkScrollableFrame):
             self.pan_offset_x = canvas_center_x - new_image_center_x
             self.pan_offset_y = canvas_center_y - new_image_center_y
             
-            self.display_image()
+            self._schedule_redraw()
         except Exception as e:
-            # print(f"DEBUG ERROR: Error zooming in: {e}")
-            pass
+            logger.error("Error zooming in: %s", e)
     
     def zoom_out(self, event=None):
         """Zoom out by 20% around the center of the current view"""
         try:
             # Get canvas center for zoom focus
-            canvas_center_x = self.canvas.winfo_width() / 2
-            canvas_center_y = self.canvas.winfo_height() / 2
+            canvas_width, canvas_height = self._canvas_size()
+            canvas_center_x = canvas_width / 2
+            canvas_center_y = canvas_height / 2
             
             # Calculate the point in the image that's currently at the center
             old_image_center_x = (canvas_center_x - self.pan_offset_x) / self.zoom_factor
@@ -346,10 +897,9 @@ class GraphViewer(ctk.CTkScrollableFrame):
             self.pan_offset_x = canvas_center_x - new_image_center_x
             self.pan_offset_y = canvas_center_y - new_image_center_y
             
-            self.display_image()
+            self._schedule_redraw()
         except Exception as e:
-            # print(f"DEBUG ERROR: Error zooming out: {e}")
-            pass
+            logger.error("Error zooming out: %s", e)
     
     def zoom_reset(self, event=None):
         """Reset zoom to fit image in window and center it"""
@@ -359,13 +909,7 @@ class GraphViewer(ctk.CTkScrollableFrame):
             
             # Center the image
             if self.original_image:
-                canvas_width = self.canvas.winfo_width()
-                canvas_height = self.canvas.winfo_height()
-                
-                if canvas_width <= 1:
-                    canvas_width = 800
-                if canvas_height <= 1:
-                    canvas_height = 600
+                canvas_width, canvas_height = self._canvas_size()
                 
                 image_width = self.original_image.width * self.zoom_factor
                 image_height = self.original_image.height * self.zoom_factor
@@ -374,79 +918,102 @@ class GraphViewer(ctk.CTkScrollableFrame):
                 self.pan_offset_x = (canvas_width - image_width) / 2
                 self.pan_offset_y = (canvas_height - image_height) / 2
             
-            self.display_image()
+            self._schedule_redraw()
         except Exception as e:
-            # print(f"DEBUG ERROR: Error resetting zoom: {e}")
-            pass
+            logger.error("Error resetting zoom: %s", e)
     
     def start_pan(self, event):
-        """Start panning"""
+        """Start panning; a release without dragging is handled as a node click"""
         try:
             # Set focus for keyboard shortcuts
             self.canvas.focus_set()
             
-            # First check if this is a node click
-            if self._handle_click_for_nodes(event):
-                return  # Node click handled, don't start panning
-            
-            # No node click, start panning
+            self._press_x = event.x
+            self._press_y = event.y
+            self._dragged = False
             self.is_panning = True
             self.pan_start_x = event.x
             self.pan_start_y = event.y
             self.canvas.configure(cursor="hand2")
         except Exception as e:
-            print(f"DEBUG ERROR: Error starting pan: {e}")
+            logger.error("Error starting pan: %s", e)
     
     def do_pan(self, event):
         """Handle panning"""
         try:
             if self.is_panning:
+                if not self._dragged:
+                    if (abs(event.x - self._press_x) <= CLICK_SLOP_PX
+                            and abs(event.y - self._press_y) <= CLICK_SLOP_PX):
+                        return
+                    self._dragged = True
                 dx = event.x - self.pan_start_x
                 dy = event.y - self.pan_start_y
                 self.pan_offset_x += dx
                 self.pan_offset_y += dy
                 self.pan_start_x = event.x
                 self.pan_start_y = event.y
-                self.display_image()
+                self._mark_interacting()
+                # Pure translation needs no new pixels unless it uncovers
+                # part of the image that was outside the rendered viewport
+                if not self._pan_rendered_image(dx, dy):
+                    self._schedule_redraw()
         except Exception as e:
-            print(f"DEBUG ERROR: Error panning: {e}")
+            logger.error("Error panning: %s", e)
     
     def end_pan(self, event):
-        """Stop panning"""
+        """Stop panning, or select the node under a click that never dragged"""
         try:
-            self.is_panning = False
+            pressed, self.is_panning = self.is_panning, False
             self.canvas.configure(cursor="arrow")
+            if pressed and not self._dragged:
+                # Pans skip the node hit test entirely
+                self._handle_click_for_nodes(event)
+            self._dragged = False
         except Exception as e:
-            print(f"DEBUG ERROR: Error stopping pan: {e}")
+            logger.error("Error stopping pan: %s", e)
     
     def on_mousewheel(self, event):
         """Handle mouse wheel events - zoom around mouse position"""
         try:
-            # Get mouse position
-            mouse_x = event.x
-            mouse_y = event.y
+            # Determine zoom direction and amount
+            if getattr(event, 'num', None) in (4, 5):
+                # Linux
+                steps = 1 if event.num == 4 else -1
+            elif abs(event.delta) >= 120:
+                # Windows reports multiples of 120 per notch
+                steps = event.delta / 120
+            else:
+                # macOS reports small raw deltas
+                steps = (event.delta > 0) - (event.delta < 0)
+            
+            self._mark_interacting()
+            
+            # Collapse a burst of wheel events into one zoom per frame
+            self._wheel_steps += steps
+            self._wheel_anchor = (event.x, event.y)
+            if self._wheel_job is None:
+                self._wheel_job = self.after(REDRAW_DELAY_MS, self._apply_wheel_zoom)
+            
+        except Exception as e:
+            logger.error("Error handling mouse wheel: %s", e)
+    
+    def _apply_wheel_zoom(self):
+        """Apply the accumulated wheel steps around the last mouse position"""
+        self._wheel_job = None
+        steps, self._wheel_steps = self._wheel_steps, 0
+        if not steps:
+            return
+        
+        try:
+            mouse_x, mouse_y = self._wheel_anchor
             
             # Calculate the point in the image that's currently under the mouse
             old_image_point_x = (mouse_x - self.pan_offset_x) / self.zoom_factor
             old_image_point_y = (mouse_y - self.pan_offset_y) / self.zoom_factor
             
-            # Determine zoom direction
-            zoom_in = False
-            if hasattr(event, 'delta'):
-                # Windows
-                zoom_in = event.delta > 0
-            elif hasattr(event, 'num'):
-                # Linux
-                zoom_in = event.num == 4
-            
-            # Apply zoom
-            if zoom_in:
-                self.zoom_factor *= 1.2
-            else:
-                new_zoom = self.zoom_factor / 1.2
-                if new_zoom < 0.1:
-                    new_zoom = 0.1
-                self.zoom_factor = new_zoom
+            # Apply zoom with minimum limit
+            self.zoom_factor = max(0.1, self.zoom_factor * 1.2 ** steps)
             
             # Calculate new pan offsets to keep the same point under the mouse
             new_image_point_x = old_image_point_x * self.zoom_factor
@@ -458,18 +1025,16 @@ class GraphViewer(ctk.CTkScrollableFrame):
             self.display_image()
             
         except Exception as e:
-            print(f"DEBUG ERROR: Error handling mouse wheel: {e}")
+            logger.error("Error applying mouse wheel zoom: %s", e)
     
     def on_resize(self, event):
         """Handle window resize events"""
         try:
             if event.widget == self:
-                # print(f"DEBUG: Resize event: {event.width}x{event.height}")
                 # Trigger a display update after resize
-                self.after(100, self.display_image)
+                self._schedule_redraw()
         except Exception as e:
-            # print(f"DEBUG: Error in resize handler: {e}")
-            pass
+            logger.error("Error in resize handler: %s", e)
     
     def set_node_click_callback(self, callback):
         """Set a callback function for node clicks"""
@@ -484,6 +1049,9 @@ class GraphViewer(ctk.CTkScrollableFrame):
         try:
             # Clear canvas and display error
             self.canvas.delete("all")
+            self.image_id = None
+            self._rendered_region = None
+            self._last_rendered = None
             self.canvas.create_text(
                 400, 300,  # Center of default canvas
                 text=message,
@@ -492,33 +1060,26 @@ class GraphViewer(ctk.CTkScrollableFrame):
                 font=("Arial", 12)
             )
         except Exception:
-            # Fallback to print if canvas operations fail
-            print(f"Graph Viewer Error: {message}")
+            # Fallback to the log if canvas operations fail
+            logger.error("Graph Viewer Error: %s", message)
     
     def _get_node_at_position(self, x, y):
         """
         Get the node ID at the given canvas coordinates.
-        This is a simplified implementation that would need to be enhanced
-        for proper SVG coordinate mapping.
+        Node boxes are read from the SVG at load time; raster images have none.
         """
         try:
-            # For now, return a placeholder - in a real implementation,
-            # this would parse the SVG file and map coordinates to node IDs
-            # This is where you'd implement the actual node detection logic
-            
             # Convert canvas coordinates to image coordinates
             if self.original_image:
                 # Account for zoom and pan
                 image_x = (x - self.pan_offset_x) / self.zoom_factor
                 image_y = (y - self.pan_offset_y) / self.zoom_factor
                 
-                # TODO: Implement actual SVG parsing and node boundary detection
-                # For now, return None to indicate no node found
-                return None
+                return self._node_boxes.find(image_x, image_y)
             
             return None
         except Exception as e:
-            print(f"DEBUG: Error getting node at position: {e}")
+            logger.debug("Error getting node at position: %s", e)
             return None
     
     def _handle_click_for_nodes(self, event):
@@ -535,11 +1096,30 @@ class GraphViewer(ctk.CTkScrollableFrame):
             
             return False  # Click not handled by node selection
         except Exception as e:
-            print(f"DEBUG: Error handling node click: {e}")
+            logger.debug("Error handling node click: %s", e)
             return False 
 
     def destroy(self):
         """Clean up resources"""
+        if getattr(self, '_redraw_job', None) is not None:
+            self.after_cancel(self._redraw_job)
+            self._redraw_job = None
+        if getattr(self, '_settle_job', None) is not None:
+            self.after_cancel(self._settle_job)
+            self._settle_job = None
+        if getattr(self, '_wheel_job', None) is not None:
+            self.after_cancel(self._wheel_job)
+            self._wheel_job = None
+        if getattr(self, '_poll_job', None) is not None:
+            self.after_cancel(self._poll_job)
+            self._poll_job = None
+        self._pending = []
+        self._load_future = None
+        self._band_futures = {}
+        for image in getattr(self, '_band_cache', {}).values():
+            image.close()
+        self._band_cache = OrderedDict()
+        
         # Clean up PIL Image objects
         if hasattr(self, 'original_image') and self.original_image:
             try:
@@ -547,9 +1127,15 @@ class GraphViewer(ctk.CTkScrollableFrame):
             except:
                 pass
             self.original_image = None
+        for level in getattr(self, 'pyramid', [])[1:]:
+            level.close()
+        self.pyramid = []
         
-        # Clear PhotoImage reference
+        # Clear PhotoImage references
         if hasattr(self, 'photo'):
             self.photo = None
+        if hasattr(self, '_tile_cache'):
+            self._tile_cache.clear()
+        self._photo_pool = []
         
         super().destroy() 
\ No newline at end of file
@@ -0,0 +1,308 @@
+"""
+Hit testing of family tree nodes in rasterized Graphviz SVGs.
+"""
+import re
+import threading
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from importlib.util import find_spec
+from typing import List, Optional, Tuple
+
+# NumPy and Numba are optional; with Numba the scans are compiled to native
+# code, with NumPy alone large polygons are ray-cast in one vectorized pass
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Numba is imported, and the kernels compiled, on a background thread by
+# compile_kernels_async; until they are ready the NumPy/Python paths run
+HAS_NUMBA = HAS_NUMPY and find_spec('numba') is not None
+
+SVG_NS = "{http://www.w3.org/2000/svg}"
+
+# Side of a spatial-grid cell in image pixels
+GRID_CELL_SIZE = 64
+
+# Polygons with more vertices than this use the vectorized NumPy ray cast
+# when Numba is unavailable
+VECTORIZE_MIN_VERTICES = 20
+
+_TRANSFORM_RE = re.compile(r'(\w+)\s*\(([^)]*)\)')
+_NUMBER_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+
+# Compiled (ray_cast, find_box) kernels, once Numba has built them
+_kernels: Optional[tuple] = None
+_compile_thread: Optional[threading.Thread] = None
+_compile_lock = threading.Lock()
+
+def _find_box(x, y, candidates, x0, y0, x1, y1):
+    """Index of the first candidate box containing (x, y), or -1"""
+    for i in candidates:
+        if x >= x0[i] and x < x1[i] and y >= y0[i] and y < y1[i]:
+            return i
+    return -1
+
+def _point_in_polygon(px, py, xs, ys):
+    """Ray casting test of (px, py) against the polygon with vertices xs, ys"""
+    inside = False
+    n = len(xs)
+    j = n - 1
+    for i in range(n):
+        xi, yi = xs[i], ys[i]
+        xj, yj = xs[j], ys[j]
+        if ((yi > py) != (yj > py)) and (px < (xj - xi) * (py - yi) / (yj - yi) + xi):
+            inside = not inside
+        j = i
+    return inside
+
+def _polygon_edges(xs, ys):
+    """
+    Edge table for the vectorized ray cast of a polygon; xs, ys are float64 arrays.
+    
+    Edge i runs from vertex i - 1 to vertex i, as in the scalar loop. Returns
+    (xs, ys, ys_prev, slope) with slope = dx/dy per edge; horizontal edges
+    never straddle the ray and get a zero slope instead of a division by zero.
+    """
+    xs_prev = np.roll(xs, 1)
+    ys_prev = np.roll(ys, 1)
+    dy = ys_prev - ys
+    slope = np.divide(xs_prev - xs, dy, out=np.zeros_like(dy), where=dy != 0)
+    return xs, ys, ys_prev, slope
+
+def _point_in_polygon_vectorized(px, py, edges):
+    """Branchless ray casting over all edges at once, from a _polygon_edges table"""
+    xs, ys, ys_prev, slope = edges
+    straddles = (ys > py) != (ys_prev > py)
+    crossing_x = (py - ys) * slope + xs
+    return bool(np.count_nonzero(straddles & (px < crossing_x)) & 1)
+
+def _compile_kernels():
+    """Import Numba and compile the kernels for the argument types used at runtime"""
+    global _kernels
+    try:
+        from numba import njit
+        ray_cast = njit(cache=True, fastmath=True)(_point_in_polygon)
+        find_box = njit(cache=True)(_find_box)
+        coords = np.zeros(3)
+        ray_cast(0.0, 0.0, coords, coords)
+        bounds = np.zeros(1, dtype=np.float32)
+        find_box(0.0, 0.0, np.zeros(1, dtype=np.int32), bounds, bounds, bounds, bounds)
+    except Exception:
+        # Numba is installed but unusable; stay on the NumPy/Python paths
+        return
+    _kernels = (ray_cast, find_box)
+
+def compile_kernels_async():
+    """Start compiling the Numba kernels on a background thread, once per process"""
+    global _compile_thread
+    if not HAS_NUMBA:
+        return
+    with _compile_lock:
+        if _compile_thread is None:
+            _compile_thread = threading.Thread(target=_compile_kernels, daemon=True)
+            _compile_thread.start()
+
+def polygon_geometry(xs, ys):
+    """
+    Hit-test geometry of a polygon, for point_in_polygon.
+    
+    Large polygons get their edge table computed here, once, for the
+    vectorized NumPy ray cast; otherwise the geometry is just (xs, ys).
+    Both forms start with xs, ys for the compiled kernel. Without Numba,
+    small polygons are converted to lists, which the Python loop indexes
+    much faster than NumPy arrays.
+    """
+    if HAS_NUMPY and len(xs) > VECTORIZE_MIN_VERTICES:
+        return _polygon_edges(xs, ys)
+    if HAS_NUMPY and not HAS_NUMBA:
+        return xs.tolist(), ys.tolist()
+    return xs, ys
+
+if HAS_NUMPY:
+    def point_in_polygon(px, py, geom):
+        """Ray casting test, compiled once Numba is ready, else vectorized for edge tables"""
+        if _kernels is not None:
+            return _kernels[0](px, py, geom[0], geom[1])
+        if len(geom) == 4:
+            return _point_in_polygon_vectorized(px, py, geom)
+        return _point_in_polygon(px, py, geom[0], geom[1])
+else:
+    def point_in_polygon(px, py, geom):
+        """Ray casting test of (px, py) against polygon_geometry output"""
+        xs, ys = geom
+        return _point_in_polygon(px, py, xs, ys)
+
+class NodeBoxes:
+    """
+    Axis-aligned bounding boxes of tree nodes in image pixel coordinates.
+
+    Boxes are bucketed into a uniform grid so a lookup only tests the
+    handful of nodes overlapping the cell under the point.
+    """
+
+    def __init__(self, ids: List[str], boxes: List[Tuple[float, float, float, float]]):
+        """
+        Args:
+            ids: Node (person) IDs
+            boxes: (x0, y0, x1, y1) for each ID, in the same order
+        """
+        self.ids = ids
+        self.boxes = boxes
+
+        grid = defaultdict(list)
+        for i, (x0, y0, x1, y1) in enumerate(boxes):
+            for cx in range(int(x0 // GRID_CELL_SIZE), int(x1 // GRID_CELL_SIZE) + 1):
+                for cy in range(int(y0 // GRID_CELL_SIZE), int(y1 // GRID_CELL_SIZE) + 1):
+                    grid[(cx, cy)].append(i)
+        self._grid = dict(grid)
+
+        if HAS_NUMBA and boxes:
+            compile_kernels_async()
+            # Structure-of-arrays layout for the compiled scan
+            columns = np.asarray(boxes, dtype=np.float32).T
+            self._x0, self._y0, self._x1, self._y1 = (
+                np.ascontiguousarray(column) for column in columns
+            )
+            self._grid = {
+                cell: np.asarray(indices, dtype=np.int32)
+                for cell, indices in self._grid.items()
+            }
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def find(self, x: float, y: float) -> Optional[str]:
+        """Return the ID of the node containing (x, y), if any"""
+        candidates = self._grid.get((int(x // GRID_CELL_SIZE), int(y // GRID_CELL_SIZE)))
+        if candidates is None:
+            return None
+        if _kernels is not None:
+            i = _kernels[1](float(x), float(y), candidates, self._x0, self._y0, self._x1, self._y1)
+            return self.ids[i] if i >= 0 else None
+        for i in candidates:
+            x0, y0, x1, y1 = self.boxes[i]
+            if x0 <= x < x1 and y0 <= y < y1:
+                return self.ids[i]
+        return None
+
+def _parse_transform(text: str) -> Tuple[float, float, float, float]:
+    """
+    Parse the scale/translate parts of an SVG transform list.
+
+    Returns:
+        tuple: (sx, sy, tx, ty) mapping x -> sx * x + tx, y -> sy * y + ty
+    """
+    sx, sy, tx, ty = 1.0, 1.0, 0.0, 0.0
+    for name, args in _TRANSFORM_RE.findall(text or ''):
+        values = [float(v) for v in _NUMBER_RE.findall(args)]
+        if name == 'translate' and values:
+            dx = values[0]
+            dy = values[1] if len(values) > 1 else 0.0
+            tx, ty = sx * dx + tx, sy * dy + ty
+        elif name == 'scale' and values:
+            sx, sy = sx * values[0], sy * (values[1] if len(values) > 1 else values[0])
+    return sx, sy, tx, ty
+
+def _parse_coords(text: str):
+    """Numbers in a points attribute; a float64 array when NumPy is available"""
+    if HAS_NUMPY:
+        try:
+            return np.array(text.replace(',', ' ').split(), dtype=np.float64)
+        except ValueError:
+            # Malformed token; let the regex pick out the numbers
+            return np.array(_NUMBER_RE.findall(text), dtype=np.float64)
+    return [float(v) for v in _NUMBER_RE.findall(text)]
+
+def _shape_bounds(elem) -> Optional[Tuple[float, float, float, float]]:
+    """(x0, y0, x1, y1) of a node's polygon/ellipse/rect shape, in its own coordinates"""
+    tag = elem.tag
+    if tag == SVG_NS + 'polygon':
+        coords = _parse_coords(elem.get('points', ''))
+        xs, ys = coords[0::2], coords[1::2]
+        if len(ys) == 0:
+            return None
+        if len(xs) > len(ys):
+            xs = xs[:len(ys)]
+        if HAS_NUMPY:
+            return float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max())
+        return min(xs), min(ys), max(xs), max(ys)
+    if tag == SVG_NS + 'ellipse':
+        cx, cy = float(elem.get('cx', 0)), float(elem.get('cy', 0))
+        rx, ry = float(elem.get('rx', 0)), float(elem.get('ry', 0))
+        return cx - rx, cy - ry, cx + rx, cy + ry
+    if tag == SVG_NS + 'rect':
+        x, y = float(elem.get('x', 0)), float(elem.get('y', 0))
+        return x, y, x + float(elem.get('width', 0)), y + float(elem.get('height', 0))
+    return None
+
+def _map_boxes(raw: List[Tuple[float, float, float, float]],
+               ax: float, bx: float, ay: float, by: float) -> List[Tuple[float, float, float, float]]:
+    """
+    Map (x0, y0, x1, y1) boxes through x -> ax * x + bx, y -> ay * y + by.
+
+    The mapping is affine per axis, so box corners map to the mapped box's
+    corners (swapped where a factor is negative).
+    """
+    if HAS_NUMPY and raw:
+        b = np.asarray(raw, dtype=np.float64)
+        xs = b[:, 0::2] * ax + bx
+        ys = b[:, 1::2] * ay + by
+        xs.sort(axis=1)
+        ys.sort(axis=1)
+        return list(zip(xs[:, 0].tolist(), ys[:, 0].tolist(), xs[:, 1].tolist(), ys[:, 1].tolist()))
+    boxes = []
+    for x0, y0, x1, y1 in raw:
+        x0, x1 = ax * x0 + bx, ax * x1 + bx
+        y0, y1 = ay * y0 + by, ay * y1 + by
+        boxes.append((min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)))
+    return boxes
+
+def read_node_boxes(svg_bytes: bytes, width: int, height: int) -> NodeBoxes:
+    """
+    Extract Graphviz node boxes, mapped onto a width x height rasterization.
+
+    The mapping matches cairosvg's default uniform ("xMidYMid meet") fit of
+    the viewBox into the output size.
+
+    Args:
+        svg_bytes: Raw SVG document
+        width: Raster width in pixels
+        height: Raster height in pixels
+    """
+    root = ET.fromstring(svg_bytes)
+    try:
+        vb_x, vb_y, vb_w, vb_h = (float(v) for v in root.get('viewBox', '').replace(',', ' ').split())
+    except ValueError:
+        return NodeBoxes([], [])
+    if vb_w <= 0 or vb_h <= 0:
+        return NodeBoxes([], [])
+
+    scale = min(width / vb_w, height / vb_h)
+    offset_x = (width - vb_w * scale) / 2 - vb_x * scale
+    offset_y = (height - vb_h * scale) / 2 - vb_y * scale
+
+    ids = []
+    boxes = []
+    for graph in root.iter(SVG_NS + 'g'):
+        if graph.get('class') != 'graph':
+            continue
+        sx, sy, tx, ty = _parse_transform(graph.get('transform'))
+        raw = []
+        for node in graph.iter(SVG_NS + 'g'):
+            if node.get('class') != 'node':
+                continue
+            title = node.find(SVG_NS + 'title')
+            if title is None or not (title.text or '').strip():
+                continue
+            bounds = [b for b in map(_shape_bounds, node) if b is not None]
+            if not bounds:
+                continue
+            ids.append(title.text.strip())
+            raw.append((min(b[0] for b in bounds), min(b[1] for b in bounds),
+                        max(b[2] for b in bounds), max(b[3] for b in bounds)))
+        # Graph transform then viewBox fit, for all of the graph's nodes at once
+        boxes.extend(_map_boxes(raw, sx * scale, tx * scale + offset_x, sy * scale, ty * scale + offset_y))
+
+    return NodeBoxes(ids, boxes)
@@ -8,9 +8,211 @@ from PIL import Image, ImageTk
 import cairosvg
 import io
 import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from itertools import chain
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Callable, Optional
 import xml.etree.ElementTree as ET
 
+# lxml (libxml2) parses faster and selects the id'd elements with a compiled
+# XPath; the stdlib parser is the fallback. The parser is shared and skips
+# what the index never reads: comments, processing instructions, ignorable
+# whitespace and libxml2's own id lookup table
+try:
+    from lxml import etree
+    _ID_XPATH = etree.XPath('descendant-or-self::*[@id]')
+    _LXML_PARSER = etree.XMLParser(
+        resolve_entities=False, huge_tree=True, collect_ids=False,
+        remove_comments=True, remove_pis=True, remove_blank_text=True
+    )
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+from .hit_testing import compile_kernels_async, point_in_polygon, polygon_geometry
+
+logger = logging.getLogger("pyFamilyTree.svgviewer")
+logger.setLevel(logging.WARNING)
+
+# NumPy is optional; when present polygon points are parsed and stored as arrays
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Canvas background; transparent raster areas are flattened onto it
+CANVAS_BACKGROUND = "white"
+
+# Cleared the first time Tk rejects a binary PPM upload (very old Tk builds)
+_ppm_upload_supported = True
+
+# SVGs are rasterized at the power-of-two scale ("pyramid stop") at or above
+# this multiple of the current zoom; zoom steps that stay within
+# [render scale / (2 * BASE_RENDER_SCALE), render scale] resample that
+# raster instead of rasterizing again
+BASE_RENDER_SCALE = 2.0
+
+# Rasters are capped at this many pixels and at cairo's largest surface side;
+# zooming beyond the cap resamples the capped raster
+RENDER_MAX_PIXELS = 32 * 1024 * 1024
+CAIRO_MAX_DIMENSION = 32767
+
+# Once idle, the neighbouring pyramid stops are rasterized ahead of time
+# unless they would exceed this many pixels
+PREFETCH_MAX_PIXELS = 4096 * 4096
+
+# Number of rasterizations (PNG bytes) kept for revisited zoom levels, on top
+# of the pinned reset-view rasterization
+PNG_CACHE_SIZE = 8
+
+# The zoomed SVG is shown as square tiles of this many pixels, created only
+# for the viewport plus TILE_MARGIN tiles on each side
+TILE_SIZE = 512
+TILE_MARGIN = 1
+
+# Number of tile PhotoImages kept so panning back and revisited zoom levels
+# skip the resample and the upload to Tk
+TILE_CACHE_SIZE = 48
+
+# Throttle for refreshing the tiles while scrolling, panning or resizing (~60 Hz)
+TILE_REFRESH_MS = 16
+
+# Rasterization workers: a zoom's render can start while a superseded render
+# or a prefetch is still running on the other
+RENDER_WORKERS = 2
+
+# How often the Tk thread checks for a finished background rasterization
+RENDER_POLL_MS = 10
+
+# Delay used to coalesce <Motion> events into one hover hit test (~60 Hz)
+HOVER_DELAY_MS = 16
+
+# Zoom clicks are applied after this delay, and only when the net change
+# relative to the displayed zoom exceeds ZOOM_EPSILON
+ZOOM_SETTLE_MS = 50
+ZOOM_EPSILON = 0.02
+
+# The SVG file is checked for changes at most this often (seconds)
+SVG_CHECK_INTERVAL = 1.0
+
+# Wheel notches arrive in bursts, so wheel zooming waits a little longer
+WHEEL_SETTLE_MS = 80
+
+# Side of a hit-test grid cell in SVG user units
+HIT_GRID_CELL = 128
+
+# Grid cells listing more elements than this are swept with one NumPy
+# bounding-box test before the per-element shape tests
+HIT_SWEEP_MIN = 64
+
+# Number of (pointer pixel, zoom) -> element results remembered for hover jitter
+HIT_MEMO_SIZE = 1024
+
+# Shape codes of indexed elements; elements other than polygons and ellipses
+# are hit-tested by their x/y/width/height rectangle
+SHAPE_RECT = 0
+SHAPE_POLYGON = 1
+SHAPE_ELLIPSE = 2
+
+SVG_NS = '{http://www.w3.org/2000/svg}'
+TAG_RECT = SVG_NS + 'rect'
+TAG_POLYGON = SVG_NS + 'polygon'
+TAG_ELLIPSE = SVG_NS + 'ellipse'
+
+# Shape code by exact element tag, with or without the SVG namespace
+_SHAPE_TAGS = {
+    TAG_RECT: SHAPE_RECT, 'rect': SHAPE_RECT,
+    TAG_POLYGON: SHAPE_POLYGON, 'polygon': SHAPE_POLYGON,
+    TAG_ELLIPSE: SHAPE_ELLIPSE, 'ellipse': SHAPE_ELLIPSE,
+}
+
+# SVG root width/height units in CSS pixels, at cairosvg's 96 dpi
+_UNIT_PX = {'': 1.0, 'px': 1.0, 'pt': 4 / 3, 'pc': 16.0, 'in': 96.0, 'cm': 96 / 2.54, 'mm': 96 / 25.4}
+_LENGTH_RE = re.compile(r'\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*([a-z]*)\s*$')
+
+def _read_svg_size(path: str) -> Optional[tuple]:
+    """(width, height) of an SVG in CSS pixels at scale 1, from its root element, or None."""
+    try:
+        _, root = next(ET.iterparse(path, events=('start',)))
+    except (StopIteration, ET.ParseError, OSError):
+        return None
+    size = []
+    for name, box_index in (('width', 2), ('height', 3)):
+        match = _LENGTH_RE.match(root.get(name, ''))
+        if match and match.group(2) in _UNIT_PX:
+            size.append(float(match.group(1)) * _UNIT_PX[match.group(2)])
+        else:
+            # Missing or relative length; fall back to the viewBox
+            try:
+                size.append(float(root.get('viewBox', '').replace(',', ' ').split()[box_index]))
+            except (IndexError, ValueError):
+                return None
+    if size[0] <= 0 or size[1] <= 0:
+        return None
+    return size[0], size[1]
+
+def _point_in_rect(x: float, y: float, geom) -> bool:
+    """
+    Check if point is inside a rectangle with rounded corners support.
+    """
+    x0, y0, x1, y1, rx, ry = geom
+    
+    # Check if point is within rectangular bounds
+    if not (x0 <= x <= x1 and y0 <= y <= y1):
+        return False
+    
+    # If no rounded corners, we're done
+    if rx <= 0 or ry <= 0:
+        return True
+    
+    # Radii are capped at half the size, so the point lies in at most one
+    # corner zone; find its arc centre, if any
+    if x < x0 + rx:
+        cx = x0 + rx
+    elif x > x1 - rx:
+        cx = x1 - rx
+    else:
+        return True
+    if y < y0 + ry:
+        cy = y0 + ry
+    elif y > y1 - ry:
+        cy = y1 - ry
+    else:
+        return True
+    
+    # Check if point is outside the corner radius
+    dx = (x - cx) / rx
+    dy = (y - cy) / ry
+    return (dx * dx + dy * dy) <= 1
+
+def _point_in_polygon(x: float, y: float, geom) -> bool:
+    """
+    Check if point is inside a polygon using ray casting algorithm.
+    """
+    return point_in_polygon(x, y, geom)
+
+def _point_in_ellipse(x: float, y: float, geom) -> bool:
+    """
+    Check if point is inside an ellipse.
+    """
+    cx, cy, rx, ry = geom
+    
+    # Ellipse equation: ((x-cx)/rx)² + ((y-cy)/ry)² <= 1
+    dx = (x - cx) / rx
+    dy = (y - cy) / ry
+    
+    return (dx * dx + dy * dy) <= 1
+
+# Precise hit test per shape code
+_POINT_IN_SHAPE = (_point_in_rect, _point_in_polygon, _point_in_ellipse)
+
 class SVGViewer(ttk.Frame):
     def __init__(self, master: tk.Widget, svg_path: str):
         """
@@ -29,6 +231,84 @@ class SVGViewer(ttk.Frame):
         self.last_x = 0
         self.last_y = 0
         
+        # Zoom requested by the zoom controls; zoom_level follows it once the
+        # pending after() job finds the change big enough to show
+        self._target_zoom = 1.0
+        self._zoom_after_id = None
+        
+        # Whether a wheel zoom is showing as a draft that still needs the
+        # full-quality pass
+        self._draft_shown = False
+        
+        # Last rasterization of the SVG and the cairosvg scale it was made at
+        self._base_image = None
+        self._base_scale = None
+        
+        # Size of the SVG in pixels at scale 1, which bounds the render scale
+        self._unit_size = None
+        
+        # PNG bytes per (SVG file signature, quantized render scale): the
+        # reset-view render is kept for good, other zoom levels in an LRU
+        self._svg_signature = None
+        self._svg_checked_at = None
+        self._static_pngs = {}
+        self._png_cache = OrderedDict()
+        self._png_lock = threading.Lock()
+        
+        # Rasterization runs on workers; the latest render's future, the scale
+        # it renders at, and the after() job polling it (Tk is only touched
+        # from its own thread, so results are polled rather than called back)
+        self._render_pool = ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix="svg-render")
+        self._render_future = None
+        self._pending_scale = None
+        self._render_check_id = None
+        self._prefetch_futures = []
+        
+        # Tiles on the canvas: (column, row) -> (image item, PhotoImage, display
+        # key it was made for); the display key, (raster scale, display size,
+        # draft), to show, tile PhotoImages keyed by that plus (column, row),
+        # and the pending refresh job
+        self._tiles = {}
+        self._display_key = None
+        self._photo_cache = OrderedDict()
+        self._tile_after_id = None
+        
+        # Whether the SVG has been indexed, and the ids, bounding boxes, shape
+        # codes and geometry of elements with geometry (document order); the
+        # parsed document itself is not kept
+        self._indexed = False
+        self._ids = []
+        self._boxes = []
+        self._codes = []
+        self._geoms = []
+        
+        # Uniform grid over the SVG: cell -> indices of the elements whose
+        # bounding box touches it, in document order
+        self._grid = {}
+        # Crowded cells -> (x0, y0, x1, y1) arrays of their elements' boxes,
+        # with the cell's indices in _grid stored as an array to match
+        self._sweep_boxes = {}
+        
+        # Outlines of the hit areas, created the first time debugging shows
+        # them and hidden rather than deleted afterwards, and the zoom their
+        # coordinates are currently scaled to
+        self.debug_hit_areas = False
+        self._hit_items_created = False
+        self._hit_zoom = 1.0
+        
+        # Hit test memoization: results per canvas pixel and zoom, the index
+        # of the last element hit, and per index whether an earlier element
+        # overlaps it (so the last hit may not be the first match)
+        self._hit_memo = OrderedDict()
+        self._last_hit = None
+        self._shadowed = {}
+        
+        # Hover coalescing: last pointer position seen, pending after() job,
+        # and the element reported by the last hover hit test
+        self._last_hover_xy = None
+        self._hover_after_id = None
+        self._last_hover_element = None
+        
         # Callbacks for node interactions
         self.node_click_callback: Optional[Callable[[str], None]] = None
         self.node_hover_callback: Optional[Callable[[str], None]] = None
@@ -40,13 +320,13 @@ class SVGViewer(ttk.Frame):
     def _setup_ui(self):
         """Set up the UI components."""
         # Create canvas for SVG display
-        self.canvas = tk.Canvas(self, bg='white')
+        self.canvas = tk.Canvas(self, bg=CANVAS_BACKGROUND)
         self.canvas.pack(fill=tk.BOTH, expand=True)
         
         # Add scrollbars
         self.h_scrollbar = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.canvas.xview)
         self.v_scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.canvas.yview)
-        self.canvas.configure(xscrollcommand=self.h_scrollbar.set, yscrollcommand=self.v_scrollbar.set)
+        self.canvas.configure(xscrollcommand=self._on_xscroll, yscrollcommand=self._on_yscroll)
         
         # Pack scrollbars
         self.h_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
@@ -66,33 +346,475 @@ class SVGViewer(ttk.Frame):
         self.info_text = tk.Text(self.info_panel, wrap=tk.WORD, width=30, height=10)
         self.info_text.pack(padx=5, pady=5)
     
-    def _load_svg(self):
-        """Load and display the SVG file."""
+    def _load_svg(self, draft: bool = False):
+        """
+        Load and display the SVG file.
+        
+        Args:
+            draft: Only resample the current raster, coarsely, without rasterizing
+        """
         try:
-            # Convert SVG to PNG using cairosvg
-            png_data = cairosvg.svg2png(url=self.svg_path, scale=self.zoom_level)
+            if not draft:
+                self._check_svg_file()
             
-            # Create PIL Image from PNG data
-            image = Image.open(io.BytesIO(png_data))
+            if not draft and self._needs_rasterize():
+                # Convert SVG to PNG in the background, with headroom for zooming in
+                self._start_render(self._render_scale(self.zoom_level))
             
-            # Convert to PhotoImage for Tkinter
-            self.photo = ImageTk.PhotoImage(image)
+            # Zooming re-renders but the geometry is unchanged; index once
+            # per version of the file
+            if not self._indexed:
+                self._build_spatial_index()
             
-            # Display on canvas
-            self.canvas.delete("all")
-            self.canvas.create_image(0, 0, image=self.photo, anchor=tk.NW)
+            # Keep the debug outlines in step with the zoom
+            if self._hit_zoom != self.zoom_level:
+                ratio = self.zoom_level / self._hit_zoom
+                self.canvas.scale("hit", 0, 0, ratio, ratio)
+                self._hit_zoom = self.zoom_level
             
-            # Update canvas scroll region
-            self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+            if self._base_image is None:
+                # First rasterization still running
+                return
             
+            # Show the raster at the current zoom; until a fresh render
+            # arrives this may briefly upscale
+            image = self._base_image
+            ratio = self.zoom_level / self._base_scale
+            size = (max(1, round(image.width * ratio)), max(1, round(image.height * ratio)))
+            display_key = (self._base_scale, size, draft)
+            if display_key != self._display_key:
+                # Tile items stay; _refresh_tiles swaps in the new images
+                self._display_key = display_key
+                
+                # Update canvas scroll region
+                self.canvas.configure(scrollregion=(0, 0, size[0], size[1]))
+            
+            self._refresh_tiles()
+            
+        except Exception as e:
+            logger.error("Error loading SVG: %s", e)
+    
+    def _refresh_tiles(self):
+        """Show the tiles covering the viewport and margin, dropping the others."""
+        if self._tile_after_id is not None:
+            self.after_cancel(self._tile_after_id)
+            self._tile_after_id = None
+        if self._display_key is None or self._base_image is None:
+            return
+        width, height = self._display_key[1]
+        
+        left = self.canvas.canvasx(0)
+        top = self.canvas.canvasy(0)
+        right = left + self.canvas.winfo_width()
+        bottom = top + self.canvas.winfo_height()
+        col0 = max(0, int(left // TILE_SIZE) - TILE_MARGIN)
+        row0 = max(0, int(top // TILE_SIZE) - TILE_MARGIN)
+        col1 = min((width - 1) // TILE_SIZE, int(right // TILE_SIZE) + TILE_MARGIN)
+        row1 = min((height - 1) // TILE_SIZE, int(bottom // TILE_SIZE) + TILE_MARGIN)
+        
+        for tile in [tile for tile in self._tiles
+                     if not (col0 <= tile[0] <= col1 and row0 <= tile[1] <= row1)]:
+            self.canvas.delete(self._tiles.pop(tile)[0])
+        
+        for col in range(col0, col1 + 1):
+            for row in range(row0, row1 + 1):
+                tile = self._tiles.get((col, row))
+                if tile is not None and tile[2] == self._display_key:
+                    continue
+                # The reference keeps the photo alive after it leaves the cache
+                photo = self._tile_photo(col, row)
+                if tile is not None:
+                    # A tile's position does not depend on the zoom; reuse the item
+                    item = tile[0]
+                    self.canvas.itemconfigure(item, image=photo)
+                else:
+                    # Below any debug outlines
+                    item = self.canvas.create_image(
+                        col * TILE_SIZE, row * TILE_SIZE, image=photo, anchor=tk.NW, tags=("tile",)
+                    )
+                    self.canvas.tag_lower(item)
+                self._tiles[(col, row)] = (item, photo, self._display_key)
+    
+    def _tile_photo(self, col: int, row: int):
+        """PhotoImage of one display tile, resampled from the current raster."""
+        key = self._display_key + (col, row)
+        photo = self._photo_cache.get(key)
+        if photo is not None:
+            self._photo_cache.move_to_end(key)
+            return photo
+        
+        image = self._base_image
+        (width, height), draft = self._display_key[1:]
+        x0, y0 = col * TILE_SIZE, row * TILE_SIZE
+        x1, y1 = min(x0 + TILE_SIZE, width), min(y0 + TILE_SIZE, height)
+        if (width, height) == image.size:
+            tile = image.crop((x0, y0, x1, y1))
+        else:
+            # Resample just the tile's region of the raster; vectorized when
+            # Pillow-SIMD is installed in place of Pillow
+            sx = image.width / width
+            sy = image.height / height
+            tile = image.resize(
+                (x1 - x0, y1 - y0),
+                Image.Resampling.NEAREST if draft else Image.Resampling.BILINEAR,
+                box=(x0 * sx, y0 * sy, x1 * sx, y1 * sy)
+            )
+        
+        photo = self._make_photo(tile)
+        if draft:
+            return photo
+        self._photo_cache[key] = photo
+        if len(self._photo_cache) > TILE_CACHE_SIZE:
+            self._photo_cache.popitem(last=False)
+        return photo
+    
+    def _make_photo(self, image):
+        """
+        Convert a PIL image to a Tk photo image.
+        
+        RGB images are handed to Tk as a binary PPM blob, skipping the extra
+        full-image copy ImageTk makes; other modes go through ImageTk.
+        """
+        global _ppm_upload_supported
+        if _ppm_upload_supported and image.mode == "RGB":
+            header = f"P6\n{image.width} {image.height}\n255\n".encode('ascii')
+            try:
+                return tk.PhotoImage(master=self.canvas, data=header + image.tobytes(), format="PPM")
+            except tk.TclError:
+                _ppm_upload_supported = False
+        return ImageTk.PhotoImage(image)
+    
+    def _schedule_tile_refresh(self):
+        """Refresh the tiles soon, at most once per TILE_REFRESH_MS."""
+        if self._tile_after_id is None:
+            self._tile_after_id = self.after(TILE_REFRESH_MS, self._refresh_tiles)
+    
+    def _on_xscroll(self, first, last):
+        """Track horizontal scrolling for the scrollbar and the tiles."""
+        self.h_scrollbar.set(first, last)
+        self._schedule_tile_refresh()
+    
+    def _on_yscroll(self, first, last):
+        """Track vertical scrolling for the scrollbar and the tiles."""
+        self.v_scrollbar.set(first, last)
+        self._schedule_tile_refresh()
+    
+    def _check_svg_file(self):
+        """Drop cached rasterizations and geometry when the SVG file has changed on disk."""
+        now = time.monotonic()
+        if self._svg_checked_at is not None and now - self._svg_checked_at < SVG_CHECK_INTERVAL:
+            return
+        self._svg_checked_at = now
+        stat = os.stat(self.svg_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._svg_signature:
+            return
+        if self._svg_signature is not None:
+            with self._png_lock:
+                self._static_pngs.clear()
+                self._png_cache.clear()
+            self._photo_cache.clear()
+            # Rasterize again; the old tiles stay on screen until then but are
+            # marked stale so the new raster replaces their images
+            self._tiles = {pos: (item, photo, None)
+                           for pos, (item, photo, _) in self._tiles.items()}
+            self._display_key = None
+            self._base_image = None
+            self._base_scale = None
+            self._pending_scale = None
+            # Parse and index again, forgetting hit results for the old geometry
+            self._indexed = False
+            self._hit_memo.clear()
+            self._last_hit = None
+            self._shadowed = {}
+        self._unit_size = _read_svg_size(self.svg_path)
+        self._svg_signature = signature
+    
+    def _render_scale(self, zoom: float) -> float:
+        """Pyramid stop to rasterize at for a zoom level, capped by _max_render_scale."""
+        # Rounding keeps zoom steps that cancel out on their stop
+        stop = 2.0 ** math.ceil(round(math.log2(zoom * BASE_RENDER_SCALE), 6))
+        return min(stop, self._max_render_scale())
+    
+    def _max_render_scale(self) -> float:
+        """Largest scale whose raster fits RENDER_MAX_PIXELS and cairo's surface limit."""
+        if self._unit_size is None:
+            return math.inf
+        width, height = self._unit_size
+        return min(math.sqrt(RENDER_MAX_PIXELS / (width * height)),
+                   CAIRO_MAX_DIMENSION / max(width, height))
+    
+    def _start_render(self, scale: float):
+        """Rasterize at a cairosvg scale on the worker, superseding any pending render."""
+        # Prefetches that have not started would delay this render
+        for future in self._prefetch_futures:
+            future.cancel()
+        self._prefetch_futures = []
+        if self._render_future is not None:
+            # Drop a superseded render that has not started yet
+            self._render_future.cancel()
+        self._pending_scale = scale
+        self._render_future = self._render_pool.submit(self._render_image, scale)
+        if self._render_check_id is None:
+            self._render_check_id = self.after(RENDER_POLL_MS, self._check_render)
+    
+    def _render_image(self, scale: float):
+        """Decoded raster of the SVG at a cairosvg scale (worker thread)."""
+        image = Image.open(io.BytesIO(self._rasterize(scale)))
+        image.load()
+        
+        # Flatten transparency here so tiles are RGB and upload as PPM
+        if "A" in image.getbands() or "transparency" in image.info:
+            rgba = image.convert("RGBA")
+            flat = Image.new("RGB", rgba.size, CANVAS_BACKGROUND)
+            flat.paste(rgba, mask=rgba.getchannel("A"))
+            return flat
+        if image.mode != "RGB":
+            return image.convert("RGB")
+        return image
+    
+    def _check_render(self):
+        """Install the latest background rasterization once it is done."""
+        self._render_check_id = None
+        future = self._render_future
+        if future is None:
+            return
+        if not future.done():
+            self._render_check_id = self.after(RENDER_POLL_MS, self._check_render)
+            return
+        
+        # Earlier futures were dropped when superseded, so this is the latest
+        self._render_future = None
+        scale, self._pending_scale = self._pending_scale, None
+        try:
+            image = future.result()
         except Exception as e:
-            print(f"Error loading SVG: {e}")
+            logger.error("Error loading SVG: %s", e)
+            return
+        self._base_image = image
+        self._base_scale = scale
+        # The raster gives the exact size cairosvg renders at
+        self._unit_size = (image.width / scale, image.height / scale)
+        self._load_svg()
+        
+        # Warm the PNG cache for the next zoom out and in; a capped raster is
+        # not a pyramid stop, so its neighbours would never be asked for
+        capped = scale >= self._max_render_scale() * (1 - 1e-6)
+        for stop in () if capped else (scale / 2, scale * 2):
+            pixels = image.width * image.height * (stop / scale) ** 2
+            if pixels <= PREFETCH_MAX_PIXELS and stop <= self._max_render_scale():
+                self._prefetch_futures.append(self._render_pool.submit(self._rasterize, stop))
+    
+    def _rasterize(self, scale: float) -> bytes:
+        """PNG bytes of the SVG at a cairosvg scale, from the cache when possible."""
+        key = (self._svg_signature, round(scale, 3))
+        with self._png_lock:
+            png_data = self._static_pngs.get(key)
+            if png_data is not None:
+                return png_data
+            png_data = self._png_cache.get(key)
+            if png_data is not None:
+                self._png_cache.move_to_end(key)
+                return png_data
+        
+        png_data = cairosvg.svg2png(url=self.svg_path, scale=scale)
+        with self._png_lock:
+            if key[1] == round(BASE_RENDER_SCALE, 3):
+                self._static_pngs[key] = png_data
+            else:
+                self._png_cache[key] = png_data
+                if len(self._png_cache) > PNG_CACHE_SIZE:
+                    self._png_cache.popitem(last=False)
+        return png_data
+    
+    def _needs_rasterize(self) -> bool:
+        """Whether the current zoom is outside what the last (or pending) raster can serve sharply."""
+        scale = self._pending_scale if self._pending_scale is not None else self._base_scale
+        if scale is None:
+            return True
+        if scale / (2 * BASE_RENDER_SCALE) <= self.zoom_level <= scale:
+            return False
+        # Beyond the capped scale the raster is resampled, not re-rendered
+        return not (self.zoom_level > scale and scale >= self._max_render_scale() * (1 - 1e-6))
+    
+    def _build_spatial_index(self):
+        """
+        Parse the SVG once and precompute the zoom-invariant geometry of every
+        element with an id; later zooms only scale it.
+        
+        Each element gets a shape code and a geometry tuple so hit tests are
+        pure arithmetic: rectangles as (x0, y0, x1, y1, rx, ry), ellipses as
+        (cx, cy, rx, ry), and polygons as polygon_geometry over (xs, ys) views
+        into flat x and y vertex buffers.
+        """
+        if HAS_LXML:
+            elements = _ID_XPATH(etree.parse(self.svg_path, _LXML_PARSER).getroot())
+        else:
+            root = ET.parse(self.svg_path).getroot()
+            elements = chain((root,), root.iterfind('.//*[@id]'))
+        
+        ids, codes, geoms, boxes = [], [], [], []
+        poly_offsets, poly_xs, poly_ys = [0], [], []  # per-polygon vertex chunks
+        
+        for elem in elements:
+            elem_id = elem.get('id')
+            if not elem_id:
+                continue
+            try:
+                shape = _SHAPE_TAGS.get(elem.tag)
+                if shape == SHAPE_POLYGON:
+                    coords = self._parse_points(elem.get('points', ''))
+                    coords = coords[:len(coords) // 2 * 2]
+                    if len(coords) < 6:
+                        continue
+                    xs, ys = coords[0::2], coords[1::2]
+                    # Geometry is filled in once the vertex buffers exist
+                    code, geom = SHAPE_POLYGON, len(poly_offsets) - 1
+                    poly_xs.append(xs)
+                    poly_ys.append(ys)
+                    poly_offsets.append(poly_offsets[-1] + len(xs))
+                    if HAS_NUMPY:
+                        box = (float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max()))
+                    else:
+                        box = (min(xs), min(ys), max(xs), max(ys))
+                elif shape == SHAPE_ELLIPSE:
+                    cx = float(elem.get('cx', 0))
+                    cy = float(elem.get('cy', 0))
+                    rx = float(elem.get('rx', 0))
+                    ry = float(elem.get('ry', 0))
+                    if rx <= 0 or ry <= 0:
+                        continue
+                    code, geom = SHAPE_ELLIPSE, (cx, cy, rx, ry)
+                    box = (cx - rx, cy - ry, cx + rx, cy + ry)
+                else:
+                    # Rectangles, and the x/y/width/height fallback for other elements
+                    x = float(elem.get('x', 0))
+                    y = float(elem.get('y', 0))
+                    x1 = x + float(elem.get('width', 0))
+                    y1 = y + float(elem.get('height', 0))
+                    if x1 <= x or y1 <= y:
+                        # Groups, text and the like have no area to hit
+                        continue
+                    rx = ry = 0.0
+                    if shape == SHAPE_RECT:
+                        rx = float(elem.get('rx', 0))  # Corner radius
+                        ry = float(elem.get('ry', 0))
+                        if ry <= 0:
+                            ry = rx
+                        if rx <= 0:
+                            rx = ry
+                        if rx > 0:
+                            # As in SVG rendering, radii are capped at half the size
+                            rx = min(rx, (x1 - x) / 2)
+                            ry = min(ry, (y1 - y) / 2)
+                    code, geom = SHAPE_RECT, (x, y, x1, y1, rx, ry)
+                    box = (x, y, x1, y1)
+            except (ValueError, TypeError):
+                continue
+            
+            ids.append(elem_id)
+            codes.append(code)
+            geoms.append(geom)
+            boxes.append(box)
+        
+        if HAS_NUMPY:
+            flat_xs = np.concatenate(poly_xs) if poly_xs else np.empty(0)
+            flat_ys = np.concatenate(poly_ys) if poly_ys else np.empty(0)
+        else:
+            flat_xs = [v for chunk in poly_xs for v in chunk]
+            flat_ys = [v for chunk in poly_ys for v in chunk]
+        for i, code in enumerate(codes):
+            if code == SHAPE_POLYGON:
+                slot = geoms[i]
+                start, end = poly_offsets[slot], poly_offsets[slot + 1]
+                geoms[i] = polygon_geometry(flat_xs[start:end], flat_ys[start:end])
+        
+        self._ids = ids
+        self._boxes = boxes
+        self._codes = codes
+        self._geoms = geoms
+        
+        grid = defaultdict(list)
+        for i, (x0, y0, x1, y1) in enumerate(boxes):
+            for cx in range(int(x0 // HIT_GRID_CELL), int(x1 // HIT_GRID_CELL) + 1):
+                for cy in range(int(y0 // HIT_GRID_CELL), int(y1 // HIT_GRID_CELL) + 1):
+                    grid[(cx, cy)].append(i)
+        self._grid = dict(grid)
+        self._sweep_boxes = {}
+        if HAS_NUMPY:
+            box_columns = np.asarray(boxes, dtype=np.float64).T if boxes else None
+            for cell, indices in self._grid.items():
+                if len(indices) > HIT_SWEEP_MIN:
+                    indices = np.asarray(indices, dtype=np.intp)
+                    self._grid[cell] = indices
+                    self._sweep_boxes[cell] = tuple(box_columns[:, indices])
+        self._indexed = True
+        if poly_xs:
+            compile_kernels_async()
+        logger.debug("Indexed %d elements (%d grid cells) from %s", len(ids), len(self._grid), self.svg_path)
+        
+        # Outlines of the previous index are stale
+        self.canvas.delete("hit")
+        self._hit_items_created = False
+        if self.debug_hit_areas:
+            self._create_hit_items()
+    
+    def _create_hit_items(self):
+        """Outline every indexed element on the canvas at the current zoom, above the image."""
+        self.canvas.delete("hit")
+        zoom = self.zoom_level
+        options = {'fill': '', 'outline': 'red', 'width': 2, 'tags': ('hit',)}
+        
+        for code, geom in zip(self._codes, self._geoms):
+            if code == SHAPE_POLYGON:
+                coords = []
+                for px, py in zip(geom[0], geom[1]):
+                    coords.append(px * zoom)
+                    coords.append(py * zoom)
+                self.canvas.create_polygon(coords, **options)
+            elif code == SHAPE_RECT:
+                x0, y0, x1, y1 = geom[:4]
+                self.canvas.create_rectangle(x0 * zoom, y0 * zoom, x1 * zoom, y1 * zoom, **options)
+            else:
+                cx, cy, rx, ry = geom
+                self.canvas.create_oval(
+                    (cx - rx) * zoom, (cy - ry) * zoom, (cx + rx) * zoom, (cy + ry) * zoom, **options
+                )
+        
+        self._hit_zoom = zoom
+        self._hit_items_created = True
+    
+    def _parse_points(self, points_str: str):
+        """
+        Flat sequence of the numbers in a polygon's points attribute, skipping bad tokens.
+        
+        With NumPy this is a float64 array converted in one call.
+        """
+        tokens = points_str.replace(',', ' ').split()
+        if HAS_NUMPY:
+            try:
+                return np.array(tokens, dtype=np.float64)
+            except ValueError:
+                # Malformed token; fall back to skipping it
+                pass
+        coords = []
+        for coord in tokens:
+            try:
+                coords.append(float(coord))
+            except ValueError:
+                continue
+        if HAS_NUMPY:
+            return np.asarray(coords, dtype=np.float64)
+        return coords
     
     def _bind_events(self):
         """Bind mouse and keyboard events."""
         # Mouse wheel for zooming
         self.canvas.bind("<MouseWheel>", self._on_mousewheel)
         
+        # Resizing exposes tiles
+        self.canvas.bind("<Configure>", lambda event: self._schedule_tile_refresh())
+        
         # Middle mouse button for panning
         self.canvas.bind("<Button-2>", self._start_pan)
         self.canvas.bind("<B2-Motion>", self._pan)
@@ -107,9 +829,17 @@ class SVGViewer(ttk.Frame):
     def _on_mousewheel(self, event):
         """Handle mouse wheel events for zooming."""
         if event.delta > 0:
-            self.zoom_in()
+            self._target_zoom *= 1.2
         else:
-            self.zoom_out()
+            self._target_zoom /= 1.2
+        
+        # Follow each notch with a coarse resample of the current raster;
+        # the settled zoom is shown at full quality
+        if self._base_image is not None:
+            self.zoom_level = self._target_zoom
+            self._draft_shown = True
+            self._load_svg(draft=True)
+        self._schedule_zoom(WHEEL_SETTLE_MS)
     
     def _start_pan(self, event):
         """Start panning the view."""
@@ -134,15 +864,33 @@ class SVGViewer(ttk.Frame):
     
     def _on_click(self, event):
         """Handle node clicks."""
+        if self.node_click_callback is None:
+            return
         # Get clicked element from SVG
         element = self._get_element_at(event.x, event.y)
-        if element and self.node_click_callback:
+        if element:
             self.node_click_callback(element)
     
     def _on_hover(self, event):
-        """Handle mouse hover over nodes."""
+        """Handle mouse hover over nodes, running at most one hit test per frame."""
+        if self.node_hover_callback is None:
+            # Nobody listens; skip the hit tests
+            return
+        if (event.x, event.y) == self._last_hover_xy:
+            return
+        self._last_hover_xy = (event.x, event.y)
+        if self._hover_after_id is not None:
+            self.after_cancel(self._hover_after_id)
+        self._hover_after_id = self.after(HOVER_DELAY_MS, self._do_hover)
+    
+    def _do_hover(self):
+        """Hit-test the latest hover position and report newly entered elements."""
+        self._hover_after_id = None
         # Get hovered element from SVG
-        element = self._get_element_at(event.x, event.y)
+        element = self._get_element_at(*self._last_hover_xy)
+        if element == self._last_hover_element:
+            return
+        self._last_hover_element = element
         if element and self.node_hover_callback:
             self.node_hover_callback(element)
     
@@ -166,193 +914,130 @@ class SVGViewer(ttk.Frame):
             svg_x = canvas_x / self.zoom_level
             svg_y = canvas_y / self.zoom_level
             
-            # Parse SVG file to find element at coordinates
-            tree = ET.parse(self.svg_path)
-            root = tree.getroot()
+            key = (canvas_x, canvas_y, self.zoom_level)
+            element = self._hit_memo.get(key, key)
+            if element is not key:
+                self._hit_memo.move_to_end(key)
+                return element
             
-            # Find clickable elements (nodes with IDs)
-            for elem in root.iter():
-                if elem.get('id'):
-                    # Check if coordinates are within element bounds
-                    # This is a simplified check - more complex geometry would need proper SVG parsing
-                    if self._point_in_element(svg_x, svg_y, elem):
-                        return elem.get('id')
+            # Consecutive events usually stay inside the element hit last
+            last = self._last_hit
+            if (last is not None and self._point_in_element(svg_x, svg_y, last)
+                    and not self._is_shadowed(last)):
+                element = self._ids[last]
+            else:
+                element = None
+                # Only elements touching the point's grid cell can contain it;
+                # the precise test settles rounded corners, and cells list
+                # elements in document order so the first match wins
+                cell = (int(svg_x // HIT_GRID_CELL), int(svg_y // HIT_GRID_CELL))
+                candidates = self._grid.get(cell, ())
+                point_in = self._point_in_element
+                sweep = self._sweep_boxes.get(cell)
+                if sweep is not None:
+                    # Crowded cell: keep only the boxes containing the point,
+                    # in one vectorized pass, so only shape tests remain
+                    x0, y0, x1, y1 = sweep
+                    inside = (x0 <= svg_x) & (svg_x <= x1) & (y0 <= svg_y) & (svg_y <= y1)
+                    candidates = candidates[inside].tolist()
+                    point_in = self._point_in_shape
+                for i in candidates:
+                    if point_in(svg_x, svg_y, i):
+                        self._last_hit = i
+                        element = self._ids[i]
+                        break
             
-            return None
+            self._hit_memo[key] = element
+            if len(self._hit_memo) > HIT_MEMO_SIZE:
+                self._hit_memo.popitem(last=False)
+            return element
             
         except Exception as e:
-            print(f"Error getting element at coordinates: {e}")
+            logger.error("Error getting element at coordinates: %s", e)
             return None
     
-    def _point_in_element(self, x: float, y: float, element) -> bool:
+    def _is_shadowed(self, index: int) -> bool:
+        """Whether an element earlier in the document overlaps the element's bounds."""
+        shadowed = self._shadowed.get(index)
+        if shadowed is None:
+            x0, y0, x1, y1 = self._boxes[index]
+            shadowed = any(
+                bx0 <= x1 and x0 <= bx1 and by0 <= y1 and y0 <= by1
+                for bx0, by0, bx1, by1 in self._boxes[:index]
+            )
+            self._shadowed[index] = shadowed
+        return shadowed
+    
+    def _point_in_element(self, x: float, y: float, index: int) -> bool:
         """
         Check if a point is within an SVG element's bounds using precise collision detection.
         
         Args:
             x: X coordinate
             y: Y coordinate
-            element: SVG element
+            index: Position of the element in the precomputed geometry
             
         Returns:
             bool: True if point is within element bounds
         """
-        try:
-            # Check different element types with proper collision detection
-            if element.tag.endswith('polygon'):
-                return self._point_in_polygon(x, y, element)
-            elif element.tag.endswith('rect'):
-                return self._point_in_rect(x, y, element)
-            elif element.tag.endswith('ellipse'):
-                return self._point_in_ellipse(x, y, element)
-            else:
-                # Fallback to bounding box for other elements
-                elem_x = float(element.get('x', 0))
-                elem_y = float(element.get('y', 0))
-                elem_width = float(element.get('width', 0))
-                elem_height = float(element.get('height', 0))
-                
-                return (elem_x <= x <= elem_x + elem_width and
-                        elem_y <= y <= elem_y + elem_height)
-                        
-        except (ValueError, TypeError):
-            return False
-    
-    def _point_in_polygon(self, x: float, y: float, polygon) -> bool:
-        """
-        Check if point is inside a polygon using ray casting algorithm.
-        """
-        points_str = polygon.get('points', '')
-        if not points_str:
-            return False
-        
-        # Parse polygon points
-        coords = []
-        for coord in points_str.replace(',', ' ').split():
-            try:
-                coords.append(float(coord))
-            except ValueError:
-                continue
-        
-        # Group into (x, y) pairs
-        points = [(coords[i], coords[i+1]) for i in range(0, len(coords)-1, 2)]
-        
-        if len(points) < 3:
-            return False
-        
-        # Ray casting algorithm with edge case handling
-        inside = False
-        j = len(points) - 1
-        
-        for i in range(len(points)):
-            xi, yi = points[i]
-            xj, yj = points[j]
-            
-            # Check if point is exactly on an edge
-            if self._point_on_edge(x, y, xi, yi, xj, yj):
-                return True
-            
-            if ((yi > y) != (yj > y)) and (x < (xj - xi) * (y - yi) / (yj - yi) + xi):
-                inside = not inside
-            j = i
-        
-        return inside
-    
-    def _point_on_edge(self, px: float, py: float, x1: float, y1: float, x2: float, y2: float) -> bool:
-        """
-        Check if a point lies on a line segment (edge of polygon).
-        """
-        # Calculate cross product to check if point is on the line
-        cross_product = (py - y1) * (x2 - x1) - (px - x1) * (y2 - y1)
-        
-        # If cross product is not zero, point is not on the line
-        if abs(cross_product) > 1e-10:  # Small epsilon for floating point precision
-            return False
-        
-        # Check if point is within the segment bounds
-        dot_product = (px - x1) * (x2 - x1) + (py - y1) * (y2 - y1)
-        squared_distance = (x2 - x1) * (x2 - x1) + (y2 - y1) * (y2 - y1)
-        
-        return 0 <= dot_product <= squared_distance
-    
-    def _point_in_rect(self, x: float, y: float, rect) -> bool:
-        """
-        Check if point is inside a rectangle with rounded corners support.
-        """
-        rect_x = float(rect.get('x', 0))
-        rect_y = float(rect.get('y', 0))
-        width = float(rect.get('width', 0))
-        height = float(rect.get('height', 0))
-        rx = float(rect.get('rx', 0))  # Corner radius
-        ry = float(rect.get('ry', 0))
-        
-        # Check if point is within rectangular bounds
-        if not (rect_x <= x <= rect_x + width and rect_y <= y <= rect_y + height):
+        # Cheap reject against the precomputed bounding box first
+        x0, y0, x1, y1 = self._boxes[index]
+        if not (x0 <= x <= x1 and y0 <= y <= y1):
             return False
         
-        # If no rounded corners, we're done
-        if rx <= 0 and ry <= 0:
-            return True
-        
-        # Handle rounded corners
-        if rx > 0 or ry > 0:
-            if ry <= 0:
-                ry = rx
-            if rx <= 0:
-                rx = ry
-                
-            # Check corner exclusion zones
-            corners = [
-                (rect_x + rx, rect_y + ry, x < rect_x + rx and y < rect_y + ry),
-                (rect_x + width - rx, rect_y + ry, x > rect_x + width - rx and y < rect_y + ry),
-                (rect_x + rx, rect_y + height - ry, x < rect_x + rx and y > rect_y + height - ry),
-                (rect_x + width - rx, rect_y + height - ry, x > rect_x + width - rx and y > rect_y + height - ry)
-            ]
-            
-            for cx, cy, in_corner in corners:
-                if in_corner:
-                    # Check if point is outside the corner radius
-                    dx = (x - cx) / rx
-                    dy = (y - cy) / ry
-                    if (dx * dx + dy * dy) > 1:
-                        return False
-        
-        return True
+        return _POINT_IN_SHAPE[self._codes[index]](x, y, self._geoms[index])
     
-    def _point_in_ellipse(self, x: float, y: float, ellipse) -> bool:
-        """
-        Check if point is inside an ellipse.
-        """
-        cx = float(ellipse.get('cx', 0))
-        cy = float(ellipse.get('cy', 0))
-        rx = float(ellipse.get('rx', 0))
-        ry = float(ellipse.get('ry', 0))
-        
-        if rx <= 0 or ry <= 0:
-            return False
-        
-        # Ellipse equation: ((x-cx)/rx)² + ((y-cy)/ry)² <= 1
-        dx = (x - cx) / rx
-        dy = (y - cy) / ry
-        
-        return (dx * dx + dy * dy) <= 1
+    def _point_in_shape(self, x: float, y: float, index: int) -> bool:
+        """Precise shape test for a point already known to be inside the element's bounding box."""
+        return _POINT_IN_SHAPE[self._codes[index]](x, y, self._geoms[index])
     
     def zoom_in(self):
         """Zoom in the view."""
-        self.zoom_level *= 1.2
-        self._load_svg()
+        self._target_zoom *= 1.2
+        self._schedule_zoom()
     
     def zoom_out(self):
         """Zoom out the view."""
-        self.zoom_level /= 1.2
+        self._target_zoom /= 1.2
+        self._schedule_zoom()
+    
+    def _schedule_zoom(self, delay: int = ZOOM_SETTLE_MS):
+        """Apply the target zoom once clicks or wheel notches pause, superseding a pending job."""
+        if self._zoom_after_id is not None:
+            self.after_cancel(self._zoom_after_id)
+        self._zoom_after_id = self.after(delay, self._maybe_render)
+    
+    def _maybe_render(self):
+        """Show the target zoom unless it is within ZOOM_EPSILON of the displayed one."""
+        self._zoom_after_id = None
+        if self._draft_shown:
+            self._draft_shown = False
+        elif abs(self._target_zoom - self.zoom_level) / self.zoom_level <= ZOOM_EPSILON:
+            return
+        self.zoom_level = self._target_zoom
         self._load_svg()
     
     def reset_view(self):
         """Reset the view to original size and position."""
+        if self._zoom_after_id is not None:
+            self.after_cancel(self._zoom_after_id)
+            self._zoom_after_id = None
+        self._target_zoom = 1.0
+        self._draft_shown = False
         self.zoom_level = 1.0
         self.pan_x = 0
         self.pan_y = 0
         self._load_svg()
     
+    def toggle_debug_areas(self):
+        """Show or hide the outlines of the areas that respond to clicks and hover."""
+        self.debug_hit_areas = not self.debug_hit_areas
+        if self.debug_hit_areas and not self._hit_items_created:
+            self._create_hit_items()
+        else:
+            # One call for all outlines; hidden ones keep following the zoom
+            self.canvas.itemconfigure("hit", state=tk.NORMAL if self.debug_hit_areas else tk.HIDDEN)
+    
     def set_node_click_callback(self, callback: Callable[[str], None]):
         """Set callback for node clicks."""
         self.node_click_callback = callback
@@ -372,4 +1057,25 @@ class SVGViewer(ttk.Frame):
     
     def clear_node_info(self):
         """Clear the info panel."""
-        self.info_text.delete(1.0, tk.END) 
\ No newline at end of file
+        self.info_text.delete(1.0, tk.END)
+    
+    def destroy(self):
+        """Cancel pending callbacks and destroy the widget."""
+        if self._hover_after_id is not None:
+            self.after_cancel(self._hover_after_id)
+            self._hover_after_id = None
+        if self._zoom_after_id is not None:
+            self.after_cancel(self._zoom_after_id)
+            self._zoom_after_id = None
+        if self._tile_after_id is not None:
+            self.after_cancel(self._tile_after_id)
+            self._tile_after_id = None
+        if self._render_check_id is not None:
+            self.after_cancel(self._render_check_id)
+            self._render_check_id = None
+        for future in self._prefetch_futures:
+            future.cancel()
+        self._prefetch_futures = []
+        self._render_future = None
+        self._render_pool.shutdown(wait=False)
+        super().destroy() 
\ No newline at end of file
@@ -4,21 +4,28 @@ Embedded web view widget for displaying HTML content within the tkinter applicat
 import customtkinter as ctk
 import tkinter as tk
 from pathlib import Path
+import functools
 import os
 import sys
 import tempfile
 import threading
+from importlib.util import find_spec
 from typing import Optional, Callable
 import webbrowser
-from urllib.parse import urljoin
 from urllib.request import pathname2url
 
-# Try to import webview library for embedded browser
-try:
+# Buffer size for reading generated HTML (embedded SVG and scripts make it large)
+HTML_READ_BUFFER = 1024 * 1024
+
+# Check for the webview library without importing it; the import is paid
+# only when an embedded browser window is actually created
+HAS_WEBVIEW = find_spec('webview') is not None
+
+@functools.lru_cache(maxsize=1)
+def _get_webview():
+    """Import pywebview on first use"""
     import webview
-    HAS_WEBVIEW = True
-except ImportError:
-    HAS_WEBVIEW = False
+    return webview
 
 # Try to import tkinter.html for basic HTML rendering
 try:
@@ -27,6 +34,142 @@ try:
 except ImportError:
     HAS_TKHTML = False
 
+# Info text shown by the fallback viewer before a file is loaded
+_DEFAULT_FALLBACK_INFO = (
+    "Interactive Family Tree Viewer\n\n"
+    "Your family tree has been generated with full interactivity!\n\n"
+    "Features:\n"
+    "• Click on any person to see their details\n"
+    "• Search family members by name\n"
+    "• Zoom and pan with mouse wheel and dragging\n"
+    "• Modern web interface with smooth animations\n"
+    "• Hover effects and tooltips\n\n"
+    "Click 'Open in Browser' above to view the interactive family tree.\n\n"
+    "The family tree is saved as an HTML file that you can:\n"
+    "• Bookmark for easy access\n"
+    "• Share with family members\n"
+    "• View offline anytime\n"
+    "• Print or export as needed"
+)
+
+# Info text shown by SimpleWebViewer before a file is loaded
+_DEFAULT_SIMPLE_CONTENT = """🌳 Interactive Family Tree Viewer
+
+Your family tree has been generated with full web-based interactivity!
+
+✨ Features:
+• Click on any person to see their detailed information
+• Search family members by name in real-time
+• Zoom and pan with mouse wheel and dragging
+• Modern web interface with smooth animations
+• Hover effects and helpful tooltips
+• Responsive design that works on any screen size
+
+🚀 How to Use:
+1. Click "Open in Browser" above to view your family tree
+2. Click on any person in the tree to see their details
+3. Use the search box to quickly find family members
+4. Zoom in/out with mouse wheel or toolbar buttons
+5. Drag to pan around large family trees
+
+💾 File Information:
+• Your family tree is saved as an HTML file
+• Works offline - no internet connection needed
+• Can be shared with family members
+• Bookmark the file for easy access
+• Print or export as needed
+
+🔧 Technical Details:
+• Built with modern web technologies
+• Responsive CSS design
+• JavaScript-powered interactions
+• SVG graphics for crisp rendering at any zoom level
+• Works in any modern web browser
+
+Click "Open in Browser" to explore your interactive family tree!"""
+
+# Info text shown by the fallback viewer for a loaded file
+_FALLBACK_INFO_TEMPLATE = (
+    "Interactive Family Tree Ready!\n\n"
+    "File: {name}\n"
+    "Location: {loc}\n"
+    "Size: {size} bytes\n\n"
+    "Click 'Open in Browser' to view the interactive family tree.\n\n"
+    "Features Available:\n"
+    "• Click on any person to see their details\n"
+    "• Search family members by name\n"
+    "• Zoom and pan with mouse wheel and dragging\n"
+    "• Modern web interface with smooth animations\n"
+    "• Hover effects and tooltips\n\n"
+    "The family tree includes advanced interactions that work best in a web browser.\n\n"
+    "This HTML file can be:\n"
+    "• Bookmarked for easy access\n"
+    "• Shared with family members\n"
+    "• Viewed offline anytime\n"
+    "• Printed or exported as needed"
+)
+
+# Info text shown by SimpleWebViewer for a loaded file
+_SIMPLE_INFO_TEMPLATE = """🌳 Interactive Family Tree Ready!
+
+File: {name}
+Size: {size} bytes
+Location: {loc}
+
+✨ Your family tree includes:
+• Click on any person to see their detailed information
+• Search family members by name in real-time
+• Zoom and pan with mouse wheel and dragging
+• Modern web interface with smooth animations
+• Hover effects and helpful tooltips
+
+🚀 Ready to explore!
+Click "Open in Browser" above to view your interactive family tree.
+
+The family tree will open in your default web browser where you can:
+• Navigate through generations with smooth animations
+• Search for specific family members instantly
+• View detailed information for each person
+• Zoom in to see fine details or zoom out for the big picture
+• Print or share the family tree easily
+
+💡 Pro Tips:
+• Bookmark the family tree page for easy access
+• Use Ctrl+F in the browser to search for specific names
+• The family tree works offline - no internet needed
+• Share the HTML file with family members
+• Right-click and "Save As" to create copies
+
+Click "Open in Browser" to start exploring your family tree!"""
+
+def _remove_file(path: str):
+    """Delete a file, ignoring one that is already gone"""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass  # File might already be deleted
+
+def _file_url(abs_path: str) -> str:
+    """
+    file: URL for an absolute path.
+    
+    pathname2url percent-encodes spaces and non-ASCII characters; on Windows
+    it already returns drive paths with the empty '//' authority.
+    """
+    url = pathname2url(abs_path)
+    return 'file:' + (url if url.startswith('//') else '//' + url)
+
+@functools.lru_cache(maxsize=8)
+def _read_html_cached(path: str, mtime_ns: int, size: int) -> str:
+    """
+    Read an HTML file in one buffered binary read, decoded once.
+    
+    The modification time and size are part of the cache key, so a changed
+    file is read again.
+    """
+    with open(path, 'rb', buffering=HTML_READ_BUFFER) as f:
+        return f.read().decode('utf-8')
+
 class EmbeddedWebViewer(ctk.CTkFrame):
     """
     An embedded web viewer widget that can display HTML content within tkinter.
@@ -36,11 +179,20 @@ class EmbeddedWebViewer(ctk.CTkFrame):
     def __init__(self, master, **kwargs):
         super().__init__(master, **kwargs)
         
-        self.html_content = ""
+        self.html_content = ""  # Not read from files shown in the webview
         self.html_file_path = None
+        # Absolute path and file:// URL of html_file_path, set when it loads
+        self._abs_path = None
+        self._file_url = None
         self.webview_window = None
         self.webview_thread = None
         self.temp_files = []  # Track temporary files for cleanup
+        # Temporary file rewritten in place by each load_html_content call
+        self._persistent_tmp_path = None
+        # (path, size, mtime_ns) of the file the info text describes
+        self._last_render_key = None
+        # (path, size, mtime_ns) of the file last loaded into the webview
+        self._webview_key = None
         
         # Configure grid
         self.grid_columnconfigure(0, weight=1)
@@ -51,7 +203,6 @@ class EmbeddedWebViewer(ctk.CTkFrame):
     
     def _init_viewer(self):
         """Initialize the appropriate web viewer based on available libraries"""
-        
         if HAS_WEBVIEW:
             print("DEBUG: Using webview library for embedded browser")
             self._init_webview_viewer()
@@ -116,6 +267,9 @@ class EmbeddedWebViewer(ctk.CTkFrame):
         self.fallback_frame = ctk.CTkFrame(self, corner_radius=0)
         self.fallback_frame.grid(row=0, column=0, sticky="nsew", padx=0, pady=0)
         
+        # Status label and info text share one font
+        font = ctk.CTkFont(size=12)
+        
         # Create toolbar
         self.toolbar = ctk.CTkFrame(self.fallback_frame, height=40)
         self.toolbar.grid(row=0, column=0, sticky="ew", padx=5, pady=5)
@@ -144,7 +298,7 @@ class EmbeddedWebViewer(ctk.CTkFrame):
         self.status_label = ctk.CTkLabel(
             self.toolbar,
             text="Ready - Click 'Open in Browser' to view",
-            font=ctk.CTkFont(size=12)
+            font=font
         )
         self.status_label.grid(row=0, column=3, padx=10, pady=5, sticky="e")
         
@@ -152,57 +306,68 @@ class EmbeddedWebViewer(ctk.CTkFrame):
         self.info_frame = ctk.CTkFrame(self.fallback_frame)
         self.info_frame.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
         self.fallback_frame.grid_rowconfigure(1, weight=1)
+        self.info_frame.grid_columnconfigure(0, weight=1)
+        self.info_frame.grid_rowconfigure(0, weight=1)
         
-        # Add info text
+        # Add info text, filled with the default text before it is gridded
         self.info_text = ctk.CTkTextbox(
             self.info_frame,
-            font=ctk.CTkFont(size=12),
+            font=font,
             wrap="word"
         )
-        self.info_text.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
-        self.info_frame.grid_columnconfigure(0, weight=1)
-        self.info_frame.grid_rowconfigure(0, weight=1)
-        
-        # Default text
-        self.info_text.insert("1.0", 
-            "Interactive Family Tree Viewer\n\n"
-            "Your family tree has been generated with full interactivity!\n\n"
-            "Features:\n"
-            "• Click on any person to see their details\n"
-            "• Search family members by name\n"
-            "• Zoom and pan with mouse wheel and dragging\n"
-            "• Modern web interface with smooth animations\n"
-            "• Hover effects and tooltips\n\n"
-            "Click 'Open in Browser' above to view the interactive family tree.\n\n"
-            "The family tree is saved as an HTML file that you can:\n"
-            "• Bookmark for easy access\n"
-            "• Share with family members\n"
-            "• View offline anytime\n"
-            "• Print or export as needed"
-        )
+        self.info_text.insert("1.0", _DEFAULT_FALLBACK_INFO)
         self.info_text.configure(state="disabled")
+        self.info_text.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
     
     def load_html_file(self, file_path: str):
         """Load HTML file into the viewer"""
-        self.html_file_path = file_path
+        previous_path, previous_content = self.html_file_path, self.html_content
+        self._set_file_path(file_path)
         
-        if not os.path.exists(file_path):
+        # One stat serves the existence check, the read cache and the info text
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
             self.status_label.configure(text="Error: File not found")
             return
+        except OSError as e:
+            self.status_label.configure(text=f"Error loading file: {str(e)}")
+            return
         
-        # Read HTML content
+        if HAS_WEBVIEW:
+            # The webview fetches the file itself from its file:// URL, so
+            # the content is never read here
+            webview_key = (file_path, stat.st_size, stat.st_mtime_ns)
+            if webview_key != self._webview_key:
+                self._webview_key = webview_key
+                self._load_webview_content()
+            return
+        
+        # Read HTML content, reusing the cached string for an unchanged file
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                self.html_content = f.read()
+            self.html_content = _read_html_cached(self._abs_path, stat.st_mtime_ns, stat.st_size)
+            if file_path == previous_path and self.html_content is previous_content:
+                # Same file, unchanged since it was shown
+                return
             
-            if HAS_WEBVIEW:
-                self._load_webview_content()
-            else:
-                self._update_fallback_info()
+            self._update_fallback_info(stat)
                 
         except Exception as e:
             self.status_label.configure(text=f"Error loading file: {str(e)}")
     
+    def _set_file_path(self, file_path: str):
+        """Record the HTML file being shown, with its absolute path and URL"""
+        self.html_file_path = file_path
+        self._abs_path = os.path.abspath(file_path)
+        self._file_url = _file_url(self._abs_path)
+    
+    def _show_content(self):
+        """Show html_file_path in the webview or the fallback info"""
+        if HAS_WEBVIEW:
+            self._load_webview_content()
+        else:
+            self._update_fallback_info()
+    
     def _load_webview_content(self):
         """Load content into webview"""
         try:
@@ -213,7 +378,7 @@ class EmbeddedWebViewer(ctk.CTkFrame):
                 self.webview_thread.start()
             else:
                 # Update existing webview
-                self.webview_window.load_url(f"file://{os.path.abspath(self.html_file_path)}")
+                self.webview_window.load_url(self._file_url)
             
             self.status_label.configure(text="Family tree loaded successfully")
             
@@ -223,10 +388,12 @@ class EmbeddedWebViewer(ctk.CTkFrame):
     def _create_webview_window(self):
         """Create webview window in separate thread"""
         try:
+            webview = _get_webview()
+            
             # Create webview window
             self.webview_window = webview.create_window(
                 'Family Tree',
-                f"file://{os.path.abspath(self.html_file_path)}",
+                self._file_url,
                 width=800,
                 height=600,
                 resizable=True,
@@ -241,38 +408,31 @@ class EmbeddedWebViewer(ctk.CTkFrame):
         except Exception as e:
             print(f"Error creating webview: {e}")
     
-    def _update_fallback_info(self):
-        """Update fallback viewer with file info"""
+    def _update_fallback_info(self, stat: Optional[os.stat_result] = None):
+        """Update fallback viewer with file info, given the file's stat if known"""
         if self.html_file_path:
+            if stat is None:
+                stat = os.stat(self.html_file_path)
+            render_key = (self.html_file_path, stat.st_size, stat.st_mtime_ns)
+            if render_key == self._last_render_key:
+                # Text already describes this file
+                return
+            file_dir, file_name = os.path.split(self.html_file_path)
+            
             self.info_text.configure(state="normal")
             self.info_text.delete("1.0", "end")
-            self.info_text.insert("1.0", 
-                f"Interactive Family Tree Ready!\n\n"
-                f"File: {os.path.basename(self.html_file_path)}\n"
-                f"Location: {os.path.dirname(self.html_file_path)}\n"
-                f"Size: {os.path.getsize(self.html_file_path)} bytes\n\n"
-                f"Click 'Open in Browser' to view the interactive family tree.\n\n"
-                f"Features Available:\n"
-                f"• Click on any person to see their details\n"
-                f"• Search family members by name\n"
-                f"• Zoom and pan with mouse wheel and dragging\n"
-                f"• Modern web interface with smooth animations\n"
-                f"• Hover effects and tooltips\n\n"
-                f"The family tree includes advanced interactions that work best in a web browser.\n\n"
-                f"This HTML file can be:\n"
-                f"• Bookmarked for easy access\n"
-                f"• Shared with family members\n"
-                f"• Viewed offline anytime\n"
-                f"• Printed or exported as needed"
+            self.info_text.insert(
+                "1.0", _FALLBACK_INFO_TEMPLATE.format(name=file_name, size=stat.st_size, loc=file_dir)
             )
             self.info_text.configure(state="disabled")
             self.status_label.configure(text="Ready - Click 'Open in Browser' to view")
+            self._last_render_key = render_key
     
     def open_in_external_browser(self):
         """Open the HTML file in external browser"""
         if self.html_file_path and os.path.exists(self.html_file_path):
             try:
-                webbrowser.open(f"file://{os.path.abspath(self.html_file_path)}")
+                webbrowser.open(self._file_url)
                 self.status_label.configure(text="Opened in external browser")
             except Exception as e:
                 self.status_label.configure(text=f"Error opening browser: {str(e)}")
@@ -282,6 +442,9 @@ class EmbeddedWebViewer(ctk.CTkFrame):
     def refresh(self):
         """Refresh the current content"""
         if self.html_file_path:
+            # An explicit refresh always reloads the webview, even for an
+            # unchanged file
+            self._webview_key = None
             self.load_html_file(self.html_file_path)
         else:
             self.status_label.configure(text="No file to refresh")
@@ -290,15 +453,22 @@ class EmbeddedWebViewer(ctk.CTkFrame):
         """Load HTML content directly"""
         self.html_content = content
         
-        # Save to temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
+        # Save to the viewer's temporary file, created on first use
+        if self._persistent_tmp_path is None:
+            fd, self._persistent_tmp_path = tempfile.mkstemp(suffix='.html')
+            os.close(fd)
+            # Track temporary file for cleanup
+            self.temp_files.append(self._persistent_tmp_path)
+        with open(self._persistent_tmp_path, 'w', encoding='utf-8', buffering=HTML_READ_BUFFER) as f:
             f.write(content)
-            temp_path = f.name
         
-        # Track temporary file for cleanup
-        self.temp_files.append(temp_path)
-        
-        self.load_html_file(temp_path)
+        # The content is already in memory, so show it without reading it back
+        self._set_file_path(self._persistent_tmp_path)
+        self._webview_key = None
+        try:
+            self._show_content()
+        except Exception as e:
+            self.status_label.configure(text=f"Error loading file: {str(e)}")
     
     def get_html_file_path(self) -> Optional[str]:
         """Get the current HTML file path"""
@@ -306,20 +476,23 @@ class EmbeddedWebViewer(ctk.CTkFrame):
     
     def destroy(self):
         """Clean up resources"""
-        # Clean up webview
+        # Clean up webview; pywebview 4+ closes windows through
+        # Window.destroy and has no module-level destroy_window
         if self.webview_window:
-            try:
-                webview.destroy_window(self.webview_window)
-            except:
-                pass
+            close = getattr(self.webview_window, 'destroy', None)
+            if close is None:
+                destroy_window = getattr(_get_webview(), 'destroy_window', None)
+                if destroy_window is not None:
+                    close = functools.partial(destroy_window, self.webview_window)
+            if close is not None:
+                try:
+                    close()
+                except Exception:
+                    pass  # Window already closed by the user
         
         # Clean up temporary files
         for temp_file in self.temp_files:
-            try:
-                if os.path.exists(temp_file):
-                    os.unlink(temp_file)
-            except OSError:
-                pass  # File might already be deleted
+            _remove_file(temp_file)
         self.temp_files.clear()
         
         super().destroy()
@@ -335,6 +508,12 @@ class SimpleWebViewer(ctk.CTkFrame):
         super().__init__(master, **kwargs)
         
         self.html_file_path = None
+        # file:// URL of html_file_path, set when it loads
+        self._file_url = None
+        # (path, size, mtime_ns) of the file the info text describes
+        self._last_render_key = None
+        # Whether the "opened in browser" notice heads the info text
+        self._opened_notice_shown = False
         
         # Configure grid
         self.grid_columnconfigure(0, weight=1)
@@ -387,94 +566,41 @@ class SimpleWebViewer(ctk.CTkFrame):
     
     def _show_default_content(self):
         """Show default content"""
-        content = """🌳 Interactive Family Tree Viewer
-
-Your family tree has been generated with full web-based interactivity!
-
-✨ Features:
-• Click on any person to see their detailed information
-• Search family members by name in real-time
-• Zoom and pan with mouse wheel and dragging
-• Modern web interface with smooth animations
-• Hover effects and helpful tooltips
-• Responsive design that works on any screen size
-
-🚀 How to Use:
-1. Click "Open in Browser" above to view your family tree
-2. Click on any person in the tree to see their details
-3. Use the search box to quickly find family members
-4. Zoom in/out with mouse wheel or toolbar buttons
-5. Drag to pan around large family trees
-
-💾 File Information:
-• Your family tree is saved as an HTML file
-• Works offline - no internet connection needed
-• Can be shared with family members
-• Bookmark the file for easy access
-• Print or export as needed
-
-🔧 Technical Details:
-• Built with modern web technologies
-• Responsive CSS design
-• JavaScript-powered interactions
-• SVG graphics for crisp rendering at any zoom level
-• Works in any modern web browser
-
-Click "Open in Browser" to explore your interactive family tree!"""
-        
         self.info_text.delete("1.0", "end")
-        self.info_text.insert("1.0", content)
+        self.info_text.insert("1.0", _DEFAULT_SIMPLE_CONTENT)
         self.info_text.configure(state="disabled")
     
     def load_html_file(self, file_path: str):
         """Load HTML file"""
         self.html_file_path = file_path
+        self._file_url = _file_url(os.path.abspath(file_path))
         
-        if not os.path.exists(file_path):
+        # One stat serves the existence check, the size and the render key
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
             self._show_error("File not found")
             return
+        except OSError as e:
+            self._show_error(f"Error loading file: {str(e)}")
+            return
         
         # Update content with file info
         try:
-            file_size = os.path.getsize(file_path)
-            file_name = os.path.basename(file_path)
+            render_key = (file_path, stat.st_size, stat.st_mtime_ns)
+            if render_key == self._last_render_key:
+                # Text already describes this file
+                return
+            file_dir, file_name = os.path.split(file_path)
             
-            content = f"""🌳 Interactive Family Tree Ready!
-
-File: {file_name}
-Size: {file_size:,} bytes
-Location: {os.path.dirname(file_path)}
-
-✨ Your family tree includes:
-• Click on any person to see their detailed information
-• Search family members by name in real-time
-• Zoom and pan with mouse wheel and dragging
-• Modern web interface with smooth animations
-• Hover effects and helpful tooltips
-
-🚀 Ready to explore!
-Click "Open in Browser" above to view your interactive family tree.
-
-The family tree will open in your default web browser where you can:
-• Navigate through generations with smooth animations
-• Search for specific family members instantly
-• View detailed information for each person
-• Zoom in to see fine details or zoom out for the big picture
-• Print or share the family tree easily
-
-💡 Pro Tips:
-• Bookmark the family tree page for easy access
-• Use Ctrl+F in the browser to search for specific names
-• The family tree works offline - no internet needed
-• Share the HTML file with family members
-• Right-click and "Save As" to create copies
-
-Click "Open in Browser" to start exploring your family tree!"""
+            content = _SIMPLE_INFO_TEMPLATE.format(name=file_name, size=f"{stat.st_size:,}", loc=file_dir)
             
             self.info_text.configure(state="normal")
             self.info_text.delete("1.0", "end")
             self.info_text.insert("1.0", content)
             self.info_text.configure(state="disabled")
+            self._last_render_key = render_key
+            self._opened_notice_shown = False
             
         except Exception as e:
             self._show_error(f"Error loading file: {str(e)}")
@@ -485,19 +611,21 @@ Click "Open in Browser" to start exploring your family tree!"""
         self.info_text.delete("1.0", "end")
         self.info_text.insert("1.0", f"❌ Error: {message}")
         self.info_text.configure(state="disabled")
+        self._last_render_key = None
+        self._opened_notice_shown = False
     
     def open_in_browser(self):
         """Open HTML file in browser"""
         if self.html_file_path and os.path.exists(self.html_file_path):
             try:
-                webbrowser.open(f"file://{os.path.abspath(self.html_file_path)}")
+                webbrowser.open(self._file_url)
                 
-                # Update status
-                self.info_text.configure(state="normal")
-                current_content = self.info_text.get("1.0", "end")
-                self.info_text.delete("1.0", "end")
-                self.info_text.insert("1.0", "✅ Family tree opened in browser!\n\n" + current_content)
-                self.info_text.configure(state="disabled")
+                # Update status, once per shown file
+                if not self._opened_notice_shown:
+                    self.info_text.configure(state="normal")
+                    self.info_text.insert("1.0", "✅ Family tree opened in browser!\n\n")
+                    self.info_text.configure(state="disabled")
+                    self._opened_notice_shown = True
                 
             except Exception as e:
                 self._show_error(f"Could not open browser: {str(e)}")
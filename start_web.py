@@ -3,11 +3,32 @@
 Startup script for the Family Tree Visualizer Web Application
 """
 import os
+import socket
 import sys
-import subprocess
-import webbrowser
 import time
-from pathlib import Path
+from importlib.util import find_spec
+from shutil import which
+
+from src.ui.browser import open_url
+
+# How long to wait for the server to accept connections before opening the
+# browser anyway, and the pause between connection attempts (seconds)
+SERVER_READY_TIMEOUT = 5.0
+SERVER_POLL_INTERVAL = 0.02
+
+# Worker threads for the waitress server, so the page's assets load in parallel
+SERVER_THREADS = 4
+
+def wait_for_server(host='127.0.0.1', port=5000, timeout=SERVER_READY_TIMEOUT):
+    """Wait until something accepts TCP connections on host:port"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=0.05).close()
+            return True
+        except OSError:
+            time.sleep(SERVER_POLL_INTERVAL)
+    return False
 
 def check_dependencies():
     """Check if all required dependencies are installed"""
@@ -22,10 +43,10 @@ def check_dependencies():
     
     missing_packages = []
     
+    # Locate each package without importing it; cairosvg and lxml load
+    # native libraries at import, and web_app imports what it needs anyway
     for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
+        if find_spec(package) is None:
             missing_packages.append(package)
     
     if missing_packages:
@@ -41,14 +62,10 @@ def check_dependencies():
 
 def check_graphviz():
     """Check if Graphviz is available in the system"""
-    try:
-        result = subprocess.run(['dot', '-V'], 
-                              capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
-            print("✅ Graphviz is available")
-            return True
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
+    # A PATH lookup is enough; the version `dot -V` would print is not used
+    if which('dot') is not None:
+        print("✅ Graphviz is available")
+        return True
     
     print("⚠️  Graphviz not found in system PATH")
     print("   This may affect visualization generation")
@@ -60,40 +77,49 @@ def create_directories():
     directories = ['uploads', 'templates', 'assets']
     
     for directory in directories:
-        Path(directory).mkdir(exist_ok=True)
+        # One stat in the usual case where the directory already exists
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
     
     print("✅ Directories created/verified")
 
 def open_browser_safely():
-    """Safely open browser with multiple fallback methods"""
+    """Open the app in the default browser, or tell the user where to go"""
     url = 'http://localhost:5000'
     
-    # Try different browser opening methods
-    browsers_to_try = [
-        'chrome',
-        'firefox',
-        'safari',
-        'edge',
-        'opera'
-    ]
-    
-    for browser in browsers_to_try:
-        try:
-            webbrowser.get(browser).open(url)
-            print(f"🌍 Browser opened successfully with {browser}")
-            return True
-        except:
-            continue
-    
-    # Fallback to default browser
-    try:
-        webbrowser.open(url)
+    # The shared default controller follows the OS choice of browser, so
+    # there is no need to probe for named browsers one by one
+    if open_url(url):
         print("🌍 Browser opened with default browser")
         return True
-    except:
-        print("📝 Please manually open your browser and navigate to:")
-        print(f"   {url}")
-        return False
+    
+    print("📝 Please manually open your browser and navigate to:")
+    print(f"   {url}")
+    return False
+
+def serve_app(app):
+    """
+    Serve the app with waitress when it is installed.
+    
+    FLASK_DEBUG=1, or a missing waitress, runs Flask's development server.
+    """
+    if os.environ.get('FLASK_DEBUG') != '1':
+        try:
+            from waitress import serve
+        except ImportError:
+            pass
+        else:
+            serve(app, host='0.0.0.0', port=5000, threads=SERVER_THREADS)
+            return
+    
+    # Run the Flask app with improved settings
+    app.run(
+        debug=True, 
+        host='0.0.0.0', 
+        port=5000, 
+        threaded=False,  # Prevent threading issues
+        use_reloader=False  # Prevent double startup
+    )
 
 def start_web_app():
     """Start the web application"""
@@ -119,9 +145,9 @@ def start_web_app():
         print("   Press Ctrl+C to stop the server")
         print("\n" + "=" * 50)
         
-        # Open browser after a short delay
+        # Open browser as soon as the server is listening
         def open_browser_delayed():
-            time.sleep(3)  # Increased delay to ensure server is ready
+            wait_for_server()
             open_browser_safely()
         
         # Start browser in a separate thread
@@ -130,14 +156,7 @@ def start_web_app():
         browser_thread.daemon = True
         browser_thread.start()
         
-        # Run the Flask app with improved settings
-        app.run(
-            debug=True, 
-            host='0.0.0.0', 
-            port=5000, 
-            threaded=False,  # Prevent threading issues
-            use_reloader=False  # Prevent double startup
-        )
+        serve_app(app)
         
     except ImportError as e:
         print(f"❌ Error importing web_app: {e}")